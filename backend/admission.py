@@ -0,0 +1,183 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+Budget = Tuple[float, float]  # (tokens per second, burst)
+
+
+class AdmissionRejected(Exception):
+    """Request turned away; the client may retry after `retry_after` seconds."""
+
+    reason = "rejected"
+
+    def __init__(self, retry_after: float):
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+
+class RateLimited(AdmissionRejected):
+    reason = "rate_limited"
+
+
+class Overloaded(AdmissionRejected):
+    reason = "overloaded"
+
+
+class LocalLimiterStore:
+    """In-memory stand-in for a shared token bucket store. Limiters given the
+    same instance (e.g. several app workers in one process) share buckets.
+
+    Buckets idle the longest are dropped past `max_keys`; an idle bucket has
+    usually refilled anyway, so dropping one only forgives a little debt.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()  # key -> (tokens, updated)
+
+    async def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        """Take `cost` tokens from `key`'s bucket; 0 when granted, otherwise
+        the seconds until enough tokens will have accrued."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        wait = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            wait = (cost - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def __len__(self):
+        return len(self._buckets)
+
+    async def close(self):
+        pass
+
+
+class RedisLimiterStore:
+    """Token buckets in Redis, shared by every worker (requires the optional
+    `redis` package). The refill and take run as one script using the Redis
+    clock, so workers on different hosts agree."""
+
+    SCRIPT = """
+    local rate, burst, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(state[1]) or burst
+    local updated = tonumber(state[2]) or now
+    tokens = math.min(burst, tokens + (now - updated) * rate)
+    local wait = 0
+    if tokens >= cost then tokens = tokens - cost else wait = (cost - tokens) / rate end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return tostring(wait)
+    """
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as aioredis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_STORE_URL points at Redis but the redis package is not installed")
+        self._redis = aioredis.from_url(url)
+        self._take = self._redis.register_script(self.SCRIPT)
+
+    async def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        return float(await self._take(keys=[key], args=[rate, burst, cost]))
+
+    async def close(self):
+        await self._redis.close()
+
+
+def create_limiter_store(url: str):
+    if not url or url == "local":
+        return LocalLimiterStore()
+    if url.startswith(("redis://", "rediss://")):
+        return RedisLimiterStore(url)
+    raise ValueError(f"Unsupported RATE_LIMIT_STORE_URL: {url}")
+
+
+class RateLimiter:
+    """Token bucket per (route class, principal), each class with its own
+    budget. Classes without a budget, or with a rate of 0, are not limited.
+
+    A store that fails lets the request through: the limiter protects the
+    server, it should not take it down with it.
+    """
+
+    def __init__(self, store, budgets: Dict[str, Budget], prefix: str = "ignitron.ratelimit"):
+        self.store = store
+        self.budgets = budgets
+        self.prefix = prefix
+        self.allowed: Dict[str, int] = {}
+        self.rejected: Dict[str, int] = {}
+        self.store_errors = 0
+
+    async def check(self, route_class: str, principal: str, cost: float = 1.0):
+        rate, burst = self.budgets.get(route_class, (0, 0))
+        if rate <= 0:
+            return
+        try:
+            wait = await self.store.take(f"{self.prefix}:{route_class}:{principal}", rate, burst, cost)
+        except Exception:
+            self.store_errors += 1
+            logger.exception("Rate limiter store failed, admitting request")
+            return
+        if wait > 0:
+            self.rejected[route_class] = self.rejected.get(route_class, 0) + 1
+            raise RateLimited(wait)
+        self.allowed[route_class] = self.allowed.get(route_class, 0) + 1
+
+    async def close(self):
+        await self.store.close()
+
+    def stats(self) -> dict:
+        return {
+            "budgets": {name: {"per_second": rate, "burst": burst} for name, (rate, burst) in self.budgets.items()},
+            "allowed": dict(self.allowed),
+            "rejected": dict(self.rejected),
+            "store_errors": self.store_errors
+        }
+
+
+class GateSlot:
+    """A request admitted by a ConcurrencyGate; release() frees the slot once,
+    however many paths (completion, error, cancellation) end up calling it."""
+
+    def __init__(self, gate: "ConcurrencyGate"):
+        self._gate = gate
+
+    def release(self):
+        gate, self._gate = self._gate, None
+        if gate is not None:
+            gate.in_flight -= 1
+
+
+class ConcurrencyGate:
+    """At most `limit` requests in flight; the next one is turned away at once
+    instead of queuing behind them. A limit of 0 disables the gate."""
+
+    def __init__(self, limit: int, retry_after: float = 1.0):
+        self.limit = limit
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    def acquire(self) -> GateSlot:
+        if self.limit > 0 and self.in_flight >= self.limit:
+            self.rejected += 1
+            raise Overloaded(self.retry_after)
+        self.in_flight += 1
+        self.admitted += 1
+        return GateSlot(self)
+
+    def stats(self) -> dict:
+        return {"limit": self.limit, "in_flight": self.in_flight, "admitted": self.admitted, "rejected": self.rejected}
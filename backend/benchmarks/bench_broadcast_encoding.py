@@ -0,0 +1,81 @@
+"""Broadcast encoding benchmark: per-socket send_json vs. one shared frame.
+
+For each simulated audience size, measures CPU time per leaderboard update
+when every socket serializes the payload itself (what send_json does) and
+when the publisher encodes it once and queues the same text to everyone.
+
+    python benchmarks/bench_broadcast_encoding.py --connections 10 100 1000
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import encoding  # noqa: E402
+
+
+def make_snapshot(colleges: int):
+    return [
+        {
+            "rank": i,
+            "college_name": f"Institute of Engineering and Technology No. {i}, Karnataka",
+            "college_code": f"CLG{i:02d}",
+            "total_points": 5000 - i * 37
+        }
+        for i in range(1, colleges + 1)
+    ]
+
+
+def per_socket(message, connections: int):
+    for _ in range(connections):
+        # starlette.websockets.WebSocket.send_json
+        text = json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+        text.encode("utf-8")
+
+
+def encode_once(message, connections: int):
+    text = encoding.dumps(message)
+    for _ in range(connections):
+        text.encode("utf-8")
+
+
+def measure(fn, message, connections: int, updates: int) -> float:
+    started = time.process_time()
+    for _ in range(updates):
+        fn(message, connections)
+    return (time.process_time() - started) / updates * 1000
+
+
+def main(args):
+    snapshot = {"type": "leaderboard_update", "version": 1, "data": make_snapshot(args.colleges)}
+    delta = {
+        "type": "leaderboard_delta", "version": 2, "base_version": 1,
+        "changed": [{"college_code": "CLG05", "rank": 2, "total_points": 4950},
+                    {"college_code": "CLG02", "rank": 3, "total_points": 4926}],
+        "removed": []
+    }
+    report = {"encoder": "orjson" if encoding.orjson else "json", "colleges": args.colleges, "runs": []}
+    for connections in args.connections:
+        updates = max(5, args.budget // connections)
+        for name, message in (("snapshot", snapshot), ("delta", delta)):
+            before = measure(per_socket, message, connections, updates)
+            after = measure(encode_once, message, connections, updates)
+            report["runs"].append({
+                "connections": connections,
+                "message": name,
+                "per_socket_cpu_ms": round(before, 4),
+                "encode_once_cpu_ms": round(after, 4),
+                "speedup": round(before / after, 1) if after else None
+            })
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--colleges", type=int, default=37)
+    parser.add_argument("--budget", type=int, default=20000, help="socket sends per measurement")
+    main(parser.parse_args())
@@ -0,0 +1,87 @@
+"""Login storm benchmark: bcrypt verification inline vs. offloaded.
+
+Simulates N concurrent logins and measures how late a 10 ms heartbeat task
+runs while they are processed. Inline verification blocks the event loop for
+the whole storm; the offloaded PasswordHasher keeps the heartbeat on time.
+
+    python benchmarks/bench_login_storm.py --logins 24 --concurrency 4
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from passwords import PasswordHasher, hash_password, verify_password  # noqa: E402
+
+HEARTBEAT_INTERVAL = 0.01
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def heartbeat(lags, stop: asyncio.Event):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + HEARTBEAT_INTERVAL
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def run_storm(mode: str, logins: int, concurrency: int, password_hash: str) -> dict:
+    hasher = PasswordHasher(max_concurrency=concurrency, queue_timeout=60)
+
+    async def login():
+        if mode == "inline":
+            return verify_password("coord1123", password_hash)
+        return await hasher.verify("coord1123", password_hash)
+
+    lags = []
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags, stop))
+    await asyncio.sleep(HEARTBEAT_INTERVAL * 2)
+
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await beat
+    hasher.shutdown()
+    assert all(outcomes)
+    return {
+        "mode": mode,
+        "logins": logins,
+        "elapsed_seconds": round(elapsed, 4),
+        "logins_per_second": round(logins / elapsed, 2),
+        "loop_lag_ms": {
+            "p50": round(percentile(lags, 50) * 1000, 2),
+            "p99": round(percentile(lags, 99) * 1000, 2),
+            "max": round(max(lags, default=0.0) * 1000, 2),
+            "mean": round(statistics.fmean(lags) * 1000, 2) if lags else 0.0
+        }
+    }
+
+
+async def main(args):
+    password_hash = hash_password("coord1123")
+    report = []
+    for mode in ("inline", "offloaded"):
+        report.append(await run_storm(mode, args.logins, args.concurrency, password_hash))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=24)
+    parser.add_argument("--concurrency", type=int, default=4)
+    asyncio.run(main(parser.parse_args()))
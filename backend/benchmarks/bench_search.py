@@ -0,0 +1,74 @@
+"""Search benchmark: latency of SearchIndex queries over college names.
+
+Indexes the seed college names (repeated and numbered for larger sizes) with
+generated codes and reports build time and per-query latency percentiles
+over a keystroke-style query mix: every prefix of a few names and codes,
+multi-word and out-of-order queries, typos and misses.
+
+    python benchmarks/bench_search.py --entries 37 1000 5000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")  # read by seed_data on import
+os.environ.setdefault("DB_NAME", "ignitron_bench")
+
+import seed_data  # noqa: E402
+from search import SearchIndex  # noqa: E402
+
+TYPED = ["KLE Institute of Technology", "Kolhapur", "Parul University", "CLG0042"]
+QUERIES = [
+    "institute technology", "hubli kle", "engineering kolhapur maharashtra", "kle #3", "pes shivamogga",
+    "kle enginering", "belgam", "vidyalankr institute", "kolhapr", "zzz", "technology of institute"
+]
+
+
+def percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main(args):
+    rng = random.Random(args.seed)
+    queries = [name[:n] for name in TYPED for n in range(1, len(name) + 1)] + QUERIES
+    report = {"queries": len(queries), "limit": args.limit, "runs": []}
+    for entries in args.entries:
+        colleges = [
+            {"id": f"c{i}", "name": seed_data._numbered(seed_data.COLLEGE_NAMES, i), "code": f"CLG{i + 1:04d}"}
+            for i in range(entries)
+        ]
+        started = time.perf_counter()
+        index = SearchIndex(("name", "code"))
+        index.load(colleges)
+        build_ms = (time.perf_counter() - started) * 1e3
+
+        samples = []
+        for _ in range(args.rounds):
+            rng.shuffle(queries)
+            for query in queries:
+                started = time.perf_counter()
+                index.search(query, args.limit)
+                samples.append((time.perf_counter() - started) * 1e6)
+        report["runs"].append({
+            "entries": entries,
+            "build_ms": round(build_ms, 1),
+            "p50_us": round(percentile(samples, 0.50), 1),
+            "p99_us": round(percentile(samples, 0.99), 1),
+            "max_us": round(max(samples), 1)
+        })
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, nargs="+", default=[37, 1000, 5000])
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=50, help="passes over the query mix")
+    parser.add_argument("--seed", type=int, default=1)
+    main(parser.parse_args())
@@ -0,0 +1,89 @@
+"""Wire format benchmark: JSON vs. compact MessagePack leaderboard frames.
+
+Builds leaderboards from the seed college names (repeated and numbered for
+larger sizes) and compares, per frame type, the payload size and encode time
+of the JSON frames sent today, MessagePack of the same structure, and the
+compact form (college dictionary once, then [id, ...] rows).
+
+    python benchmarks/bench_wire_format.py --colleges 37 200 1000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")  # read by seed_data on import
+os.environ.setdefault("DB_NAME", "ignitron_bench")
+
+import encoding  # noqa: E402
+import seed_data  # noqa: E402
+from leaderboard import CollegeIds, compact_delta, compact_snapshot, diff_leaderboards  # noqa: E402
+
+
+def make_leaderboard(colleges: int, shift: int = 0):
+    entries = [
+        {
+            "college_name": seed_data._numbered(seed_data.COLLEGE_NAMES, i),
+            "college_code": f"CLG{i + 1:02d}",
+            "total_points": 5000 - i * 37 + (400 if i == shift else 0)
+        }
+        for i in range(colleges)
+    ]
+    entries.sort(key=lambda e: (-e["total_points"], e["college_code"]))
+    for rank, entry in enumerate(entries, 1):
+        entry["rank"] = rank
+    return entries
+
+
+def measure(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main(args):
+    if encoding.msgpack is None:
+        sys.exit("msgpack is not installed")
+    report = {"json_encoder": "orjson" if encoding.orjson else "json", "runs": []}
+    for colleges in args.colleges:
+        before = make_leaderboard(colleges)
+        after = make_leaderboard(colleges, shift=min(5, colleges - 1))
+        changed, removed = diff_leaderboards(before, after)
+        ids = CollegeIds()
+        compact_snapshot(before, ids)  # the client already has the dictionary when deltas arrive
+
+        frames = {
+            "snapshot": (
+                {"type": "leaderboard_update", "version": 1, "data": before},
+                lambda: {"type": "leaderboard_update", "version": 1, **compact_snapshot(before, ids)}
+            ),
+            "delta": (
+                {"type": "leaderboard_delta", "version": 2, "base_version": 1, "changed": changed, "removed": removed},
+                lambda: {"type": "leaderboard_delta", "version": 2, "base_version": 1,
+                         **compact_delta(changed, removed, ids)}
+            )
+        }
+        for name, (verbose, compact) in frames.items():
+            encoders = {
+                "json": lambda: encoding.dumps_bytes(verbose),
+                "msgpack": lambda: encoding.packb(verbose),
+                "msgpack_compact": lambda: encoding.packb(compact())
+            }
+            run = {"colleges": colleges, "frame": name}
+            for label, encode in encoders.items():
+                run[f"{label}_bytes"] = len(encode())
+                run[f"{label}_encode_us"] = round(measure(encode, args.repeat), 2)
+            run["size_ratio"] = round(run["msgpack_compact_bytes"] / run["json_bytes"], 3)
+            report["runs"].append(run)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--colleges", type=int, nargs="+", default=[37, 200, 1000])
+    parser.add_argument("--repeat", type=int, default=2000, help="encodes per measurement")
+    main(parser.parse_args())
@@ -0,0 +1,392 @@
+"""End-to-end load benchmark for server.py, run in-process over ASGI.
+
+Seeds a synthetic fixture of the requested size (seed_data.generate_fixture),
+starts the app's lifespan, then runs:
+
+  1. a login storm (concurrent POST /api/auth/login),
+  2. a mixed phase for --duration seconds: coordinators posting results,
+     viewers polling GET /api/leaderboard, and N /ws/leaderboard subscribers.
+
+Prints a JSON report with p50/p95/p99 latency and throughput per operation,
+event-loop lag and broadcast delivery lag (write completion -> first frame
+received by each subscriber). No network is needed: by default it runs on an
+in-memory Mongo stand-in (mongomock-motor); pass --mongo-url for a real mongod.
+
+    python benchmarks/harness.py --colleges 500 --events 200 --results 100000 \\
+        --subscribers 200 --duration 20 --output bench.json
+"""
+import argparse
+import asyncio
+import bisect
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+# server.py and seed_data.py read these at import time; the harness swaps in its
+# own database before the app starts.
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "ignitron_bench")
+# Measures capacity, so admission control is off unless asked for
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("EXPENSIVE_ROUTE_CONCURRENCY", "0")
+
+BENCH_PASSWORD = "bench-pass-123"
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(latencies: List[float], elapsed: Optional[float] = None, errors: int = 0) -> dict:
+    ordered = sorted(latencies)
+    summary = {
+        "count": len(ordered),
+        "errors": errors,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round((ordered[-1] if ordered else 0.0) * 1000, 3)
+    }
+    if elapsed:
+        summary["throughput_per_s"] = round(len(ordered) / elapsed, 2)
+    return summary
+
+
+class ASGIClient:
+    """Just enough of an HTTP/WebSocket client to drive an ASGI app directly."""
+
+    def __init__(self, app):
+        self.app = app
+
+    @staticmethod
+    def _scope(kind: str, path: str, headers: Dict[str, str]) -> dict:
+        path, _, query = path.partition("?")
+        return {
+            "type": kind,
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "scheme": "http" if kind == "http" else "ws",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": [(b"host", b"bench")] + [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+            "client": ("127.0.0.1", 50000),
+            "server": ("bench", 80),
+            "subprotocols": []
+        }
+
+    async def request(self, method: str, path: str, body=None, headers=None) -> Tuple[int, dict, bytes]:
+        payload = json.dumps(body).encode() if body is not None else b""
+        all_headers = {"content-type": "application/json", "content-length": str(len(payload))}
+        all_headers.update(headers or {})
+        scope = self._scope("http", path, all_headers)
+        scope["method"] = method
+        request_sent = False
+        disconnected = asyncio.Event()
+        response = {"status": 0, "headers": {}, "body": []}
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": payload, "more_body": False}
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = {k.decode().lower(): v.decode() for k, v in message.get("headers", [])}
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            disconnected.set()
+        return response["status"], response["headers"], b"".join(response["body"])
+
+    async def websocket(self, path: str, on_frame, stop: asyncio.Event):
+        inbox: asyncio.Queue = asyncio.Queue()
+        inbox.put_nowait({"type": "websocket.connect"})
+
+        async def send(message):
+            if message["type"] == "websocket.send":
+                on_frame(message.get("text") or message.get("bytes"))
+            elif message["type"] == "websocket.close":
+                stop.set()
+
+        async def close_when_stopped():
+            await stop.wait()
+            inbox.put_nowait({"type": "websocket.disconnect", "code": 1000})
+
+        closer = asyncio.create_task(close_when_stopped())
+        try:
+            await self.app(self._scope("websocket", path, {}), inbox.get, send)
+        finally:
+            closer.cancel()
+
+    async def lifespan(self):
+        inbox: asyncio.Queue = asyncio.Queue()
+        outbox: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(self.app({"type": "lifespan", "asgi": {"version": "3.0"}}, inbox.get, outbox.put))
+        await inbox.put({"type": "lifespan.startup"})
+        message = await outbox.get()
+        if message["type"] != "lifespan.startup.complete":
+            raise RuntimeError(f"App startup failed: {message}")
+
+        async def shutdown():
+            await inbox.put({"type": "lifespan.shutdown"})
+            await outbox.get()
+            await task
+        return shutdown
+
+
+class LoopLagMonitor:
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lags: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, loop.time() - expected))
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> dict:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        return summarize(self.lags)
+
+
+def open_database(args):
+    if args.mongo_url:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(args.mongo_url)
+    else:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            sys.exit("The in-memory stand-in needs mongomock-motor (pip install mongomock-motor), "
+                     "or pass --mongo-url for a local mongod")
+        client = AsyncMongoMockClient()
+    return client, client[args.db_name]
+
+
+def use_database(server, client, db, in_memory: bool):
+    """Point the app's module-level client/db (and components holding them) at `db`."""
+    server.client = client
+    server.db = db
+    holders = ("reconciler", "shared_feed", "history", "event_cache", "college_cache")
+    for component in (getattr(server, name, None) for name in holders):
+        if component is not None and hasattr(component, "db"):
+            component.db = db
+    if in_memory:
+        # The stand-in has no replica set, so no transactions
+        server._transactions_supported = False
+
+
+async def seed(db, fixture) -> float:
+    started = time.perf_counter()
+    for name in ("leaderboard_snapshots", "result_tombstones"):
+        await db[name].delete_many({})
+    for name in ("users", "events", "colleges", "results"):
+        await db[name].delete_many({})
+        docs = fixture[name]
+        for start in range(0, len(docs), 10000):
+            await db[name].insert_many([dict(d) for d in docs[start:start + 10000]], ordered=False)
+    return time.perf_counter() - started
+
+
+async def login(client: ASGIClient, email: str, password: str) -> Tuple[float, Optional[str]]:
+    started = time.perf_counter()
+    status, _, body = await client.request("POST", "/api/auth/login", {"email": email, "password": password})
+    elapsed = time.perf_counter() - started
+    return elapsed, json.loads(body)["access_token"] if status == 200 else None
+
+
+async def run(args) -> dict:
+    import seed_data
+    import server
+    from passwords import hash_password
+
+    report = {
+        "commit": git_commit(),
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "database": "mongod" if args.mongo_url else "in-memory"
+    }
+
+    fixture = seed_data.generate_fixture(
+        colleges=args.colleges, events=args.events, results=args.results, seed=args.seed,
+        shared_password=BENCH_PASSWORD, hash_fn=hash_password
+    )
+    mongo_client, db = open_database(args)
+    use_database(server, mongo_client, db, in_memory=not args.mongo_url)
+    report["fixture"] = {
+        "users": len(fixture["users"]), "events": len(fixture["events"]),
+        "colleges": len(fixture["colleges"]), "results": len(fixture["results"]),
+        "seed_seconds": round(await seed(db, fixture), 3)
+    }
+
+    client = ASGIClient(server.app)
+    started = time.perf_counter()
+    shutdown = await client.lifespan()
+    report["startup_seconds"] = round(time.perf_counter() - started, 3)
+
+    monitor = LoopLagMonitor()
+    monitor.start()
+    rng = random.Random(args.seed)
+    coordinators = [c for c in fixture["credentials"] if c["role"] == "coordinator"]
+
+    # 1. Login storm
+    storm = [coordinators[i % len(coordinators)] for i in range(max(args.logins, args.writers))]
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(login(client, c["email"], BENCH_PASSWORD) for c in storm))
+    storm_elapsed = time.perf_counter() - started
+    report["login_storm"] = summarize([t for t, _ in outcomes], storm_elapsed,
+                                      errors=sum(1 for _, token in outcomes if token is None))
+    report["login_storm"]["loop_lag"] = summarize(list(monitor.lags))
+    writers = [(c, token) for c, (_, token) in zip(storm, outcomes) if token][:args.writers]
+
+    # 2. Subscribers
+    stop = asyncio.Event()
+    frames: List[List[float]] = [[] for _ in range(args.subscribers)]
+    connected = [asyncio.Event() for _ in range(args.subscribers)]
+
+    def on_frame(i):
+        def record(_frame):
+            if connected[i].is_set():
+                frames[i].append(time.perf_counter())
+            else:
+                connected[i].set()  # initial snapshot
+        return record
+
+    sockets = [asyncio.create_task(client.websocket("/ws/leaderboard", on_frame(i), stop))
+               for i in range(args.subscribers)]
+    await asyncio.gather(*(e.wait() for e in connected))
+
+    # 3. Mixed workload
+    latencies: Dict[str, List[float]] = {"result_write": [], "leaderboard_read": []}
+    errors = {"result_write": 0, "leaderboard_read": 0}
+    write_times: List[float] = []
+    deadline = time.perf_counter() + args.duration
+    colleges = fixture["colleges"]
+
+    async def writer(credentials, token):
+        headers = {"authorization": f"Bearer {token}"}
+        while time.perf_counter() < deadline:
+            body = {
+                "event_id": credentials["event_id"],
+                "college_id": rng.choice(colleges)["id"],
+                "points": rng.choice(seed_data.POINT_CHOICES),
+                "achievement_statement": "Benchmark result"
+            }
+            started = time.perf_counter()
+            status, _, _ = await client.request("POST", "/api/results", body, headers)
+            done = time.perf_counter()
+            latencies["result_write"].append(done - started)
+            if status == 200:
+                write_times.append(done)
+            else:
+                errors["result_write"] += 1
+            # The in-memory driver can complete without suspending; let readers in
+            await asyncio.sleep(args.write_interval)
+
+    async def reader():
+        etag = None
+        while time.perf_counter() < deadline:
+            headers = {"if-none-match": etag} if etag and rng.random() < args.conditional_ratio else {}
+            started = time.perf_counter()
+            status, response_headers, _ = await client.request("GET", "/api/leaderboard", headers=headers)
+            latencies["leaderboard_read"].append(time.perf_counter() - started)
+            if status not in (200, 304):
+                errors["leaderboard_read"] += 1
+            etag = response_headers.get("etag", etag)
+            await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(writer(c, t) for c, t in writers), *(reader() for _ in range(args.readers)))
+    elapsed = time.perf_counter() - started
+    report["operations"] = {name: summarize(values, elapsed, errors[name]) for name, values in latencies.items()}
+
+    # Let the publisher flush the last coalescing window
+    await asyncio.sleep(server.LEADERBOARD_MAX_STALENESS_MS / 1000 + 0.5)
+    lags, undelivered = [], 0
+    for received in frames:
+        for written in write_times:
+            index = bisect.bisect_right(received, written)
+            if index < len(received):
+                lags.append(received[index] - written)
+            else:
+                undelivered += 1
+    report["broadcast"] = {
+        "subscribers": args.subscribers,
+        "frames_received": sum(len(f) for f in frames),
+        "delivery_lag": summarize(lags),
+        "undelivered": undelivered,
+        "connection_manager": server.manager.stats()
+    }
+    report["loop_lag"] = await monitor.stop()
+
+    stop.set()
+    await asyncio.gather(*sockets, return_exceptions=True)
+    await shutdown()
+    return report
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--colleges", type=int, default=37)
+    parser.add_argument("--events", type=int, default=23)
+    parser.add_argument("--results", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of mixed workload")
+    parser.add_argument("--writers", type=int, default=4, help="concurrent coordinators posting results")
+    parser.add_argument("--write-interval", type=float, default=0.0, help="pause between a writer's posts")
+    parser.add_argument("--readers", type=int, default=8, help="concurrent leaderboard pollers")
+    parser.add_argument("--conditional-ratio", type=float, default=0.5,
+                        help="share of reads sent with If-None-Match")
+    parser.add_argument("--subscribers", type=int, default=50, help="simulated /ws/leaderboard clients")
+    parser.add_argument("--logins", type=int, default=20, help="concurrent logins in the login storm")
+    parser.add_argument("--mongo-url", default=None, help="use this mongod instead of the in-memory stand-in")
+    parser.add_argument("--db-name", default="ignitron_bench")
+    parser.add_argument("--output", default=None, help="write the JSON report here as well as stdout")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+import asyncio
+import json
+import logging
+import uuid
+from collections import OrderedDict
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict], Awaitable[None]]
+
+# Identifies this process in messages it publishes to a shared feed
+WORKER_ID = uuid.uuid4().hex
+
+
+class RecentKeys:
+    """Bounded set of recently seen keys, used to drop duplicate deliveries."""
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._keys: "OrderedDict[str, None]" = OrderedDict()
+
+    def add(self, key: str) -> bool:
+        """Remember `key`; False if it was already seen."""
+        if key in self._keys:
+            self._keys.move_to_end(key)
+            return False
+        self._keys[key] = None
+        if len(self._keys) > self.maxsize:
+            self._keys.popitem(last=False)
+        return True
+
+    def __contains__(self, key: str):
+        return key in self._keys
+
+
+class BroadcastBackend:
+    """Feed of state changes shared by every worker serving the app.
+
+    Workers publish the changes they make; the backend delivers changes made by
+    *other* workers to `handler`, which applies them to the local in-memory
+    state so each worker can publish to its own WebSocket subscribers.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self.delivered = 0
+        self.duplicates = 0
+        self._handler: Optional[Handler] = None
+
+    async def start(self, handler: Handler):
+        self._handler = handler
+
+    async def publish(self, message: dict):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def _deliver(self, message: dict):
+        self.delivered += 1
+        try:
+            await self._handler(message)
+        except Exception:
+            logger.exception(f"Failed to apply shared change {message.get('kind')}")
+
+    def stats(self) -> dict:
+        return {"backend": self.name, "worker_id": WORKER_ID, "delivered": self.delivered,
+                "duplicates": self.duplicates}
+
+
+class InProcessBackend(BroadcastBackend):
+    """Single worker: local writes already updated local state, nothing to share."""
+
+    name = "inprocess"
+
+
+class LocalBroker:
+    """In-memory stand-in for a pub/sub broker. Every subscriber of a channel
+    receives every message published to it, including its own."""
+
+    def __init__(self):
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+
+    async def publish(self, channel: str, data: bytes):
+        for queue in self._subscribers.get(channel, []):
+            queue.put_nowait(data)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[bytes]:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(channel, []).append(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers[channel].remove(queue)
+
+    async def close(self):
+        pass
+
+
+class RedisBroker:
+    """Redis pub/sub broker (requires the optional `redis` package)."""
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as aioredis
+        except ImportError:
+            raise RuntimeError("BROADCAST_BROKER_URL points at Redis but the redis package is not installed")
+        self._redis = aioredis.from_url(url)
+
+    async def publish(self, channel: str, data: bytes):
+        await self._redis.publish(channel, data)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[bytes]:
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(channel)
+        try:
+            async for item in pubsub.listen():
+                if item.get("type") == "message":
+                    yield item["data"]
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.close()
+
+    async def close(self):
+        await self._redis.close()
+
+
+class BrokerBackend(BroadcastBackend):
+    """Changes are published to a broker channel that every worker subscribes to.
+
+    Messages carry a unique id and the publishing worker's id; a worker skips
+    its own messages and any id it has already applied.
+    """
+
+    name = "broker"
+
+    def __init__(self, broker, channel: str = "ignitron.changes"):
+        super().__init__()
+        self.broker = broker
+        self.channel = channel
+        self._seen = RecentKeys()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, handler: Handler):
+        await super().start(handler)
+        ready = asyncio.Event()
+        self._task = asyncio.create_task(self._listen(ready))
+        await ready.wait()
+
+    async def _listen(self, ready: asyncio.Event):
+        while True:
+            try:
+                stream = self.broker.subscribe(self.channel)
+                ready.set()
+                async for data in stream:
+                    message = json.loads(data)
+                    if message.get("origin") == WORKER_ID:
+                        continue
+                    if not self._seen.add(message["id"]):
+                        self.duplicates += 1
+                        continue
+                    await self._deliver(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Broker subscription failed, resubscribing")
+                ready.set()
+                await asyncio.sleep(1)
+                # Anything published meanwhile was missed
+                await self._deliver({"kind": "resync"})
+
+    async def publish(self, message: dict):
+        message = dict(message, id=uuid.uuid4().hex, origin=WORKER_ID)
+        await self.broker.publish(self.channel, json.dumps(message).encode())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.broker.close()
+
+
+class ChangeStreamBackend(BroadcastBackend):
+    """Uses MongoDB change streams on colleges, events and results as the feed,
+    so writes are seen by every worker without a separate broker.
+
+    College documents carry absolute totals, so applying them is idempotent.
+    Updates that only change total_points (the $inc of every result write)
+    become totals-only changes, which do not touch the college directory.
+    Result inserts are keyed by result id and skipped by the handler when the
+    local worker already applied them. Deletes need pre-images to be applied
+    incrementally; without them the handler is asked to resync.
+    Requires a replica set or sharded cluster.
+    """
+
+    name = "changestream"
+    collections = ("colleges", "events", "results")
+
+    def __init__(self, db, pre_images: bool = False):
+        super().__init__()
+        self.db = db
+        self.pre_images = pre_images
+        self._seen = RecentKeys()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, handler: Handler):
+        await super().start(handler)
+        self._task = asyncio.create_task(self._listen())
+
+    async def _listen(self):
+        pipeline = [{"$match": {"ns.coll": {"$in": list(self.collections)}}}]
+        options = {"full_document": "updateLookup"}
+        if self.pre_images:
+            options["full_document_before_change"] = "whenAvailable"
+        resume_after = None
+        while True:
+            try:
+                async with self.db.watch(pipeline, resume_after=resume_after, **options) as stream:
+                    async for change in stream:
+                        resume_after = stream.resume_token
+                        if not self._seen.add(json.dumps(change["_id"], default=str)):
+                            self.duplicates += 1
+                            continue
+                        message = self._to_message(change)
+                        if message is not None:
+                            await self._deliver(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Change stream failed, reopening")
+                resume_after = None
+                await asyncio.sleep(1)
+                await self._deliver({"kind": "resync"})
+
+    @staticmethod
+    def _strip(doc: Optional[dict]) -> Optional[dict]:
+        if doc is None:
+            return None
+        return {k: v for k, v in doc.items() if k != "_id"}
+
+    def _to_message(self, change: dict) -> Optional[dict]:
+        op = change["operationType"]
+        if op in ("drop", "rename", "dropDatabase", "invalidate"):
+            return {"kind": "resync"}
+        collection = change["ns"]["coll"]
+        doc = self._strip(change.get("fullDocument"))
+        before = self._strip(change.get("fullDocumentBeforeChange"))
+
+        if op in ("insert", "update", "replace"):
+            if doc is None:
+                return None
+            if collection == "results":
+                if op != "insert":
+                    return {"kind": "resync"}
+                return {"kind": "results", "op": "add", "apply_totals": False, "results": [doc]}
+            if collection == "colleges":
+                # Every result write $incs total_points; those only move the standings
+                update = change.get("updateDescription") or {}
+                updated = update.get("updatedFields") or {}
+                if op == "update" and set(updated) == {"total_points"} and not update.get("removedFields"):
+                    return {"kind": "college_totals", "totals": {doc["id"]: updated["total_points"]}}
+                return {"kind": "college", "op": "upsert", "college": doc}
+            return {"kind": "event", "op": "upsert", "event": doc}
+
+        if op == "delete":
+            if before is None:
+                return {"kind": "resync"}
+            if collection == "results":
+                return {"kind": "results", "op": "remove", "apply_totals": False, "results": [before]}
+            if collection == "colleges":
+                return {"kind": "college", "op": "remove", "id": before["id"]}
+            return {"kind": "event", "op": "remove", "id": before["id"]}
+        return None
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def create_backend(kind: str, db=None, broker_url: Optional[str] = None, pre_images: bool = False) -> BroadcastBackend:
+    if kind == "inprocess":
+        return InProcessBackend()
+    if kind == "changestream":
+        return ChangeStreamBackend(db, pre_images=pre_images)
+    if kind == "broker":
+        if not broker_url or broker_url == "local":
+            return BrokerBackend(LocalBroker())
+        if broker_url.startswith(("redis://", "rediss://")):
+            return BrokerBackend(RedisBroker(broker_url))
+        raise ValueError(f"Unsupported BROADCAST_BROKER_URL: {broker_url}")
+    raise ValueError(f"Unknown BROADCAST_BACKEND: {kind}")
@@ -0,0 +1,90 @@
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """Small LRU cache whose entries also expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        expires_at, value = item
+        if expires_at <= self._clock():
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        self._data[key] = (self._clock() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+    def __len__(self):
+        return len(self._data)
+
+
+class VersionedResponseCache:
+    """Per-dataset version counters plus the last encoded body of each dataset.
+
+    Mutating routes call bump(); readers use etag() for conditional requests and
+    get()/put() to reuse an encoded body until the dataset changes again.
+    """
+
+    def __init__(self):
+        self.instance = uuid.uuid4().hex[:8]
+        self.versions: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._bodies: Dict[tuple, tuple] = {}
+
+    def version(self, dataset: str) -> int:
+        return self.versions.get(dataset, 0)
+
+    def bump(self, *datasets: str):
+        for dataset in datasets:
+            self.versions[dataset] = self.versions.get(dataset, 0) + 1
+
+    def etag(self, dataset: str, variant: str = "") -> str:
+        suffix = f"-{variant}" if variant else ""
+        return f'W/"{dataset}-{self.instance}-{self.version(dataset)}{suffix}"'
+
+    def get(self, dataset: str, variant: str = "") -> Optional[bytes]:
+        item = self._bodies.get((dataset, variant))
+        if item is None or item[0] != self.version(dataset):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return item[1]
+
+    def put(self, dataset: str, version: int, body: bytes, variant: str = ""):
+        self._bodies[(dataset, variant)] = (version, body)
+
+    def stats(self) -> dict:
+        return {"versions": dict(self.versions), "hits": self.hits, "misses": self.misses,
+                "not_modified": self.not_modified}
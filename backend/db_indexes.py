@@ -0,0 +1,118 @@
+import logging
+from typing import Dict, List, Sequence, Tuple
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Indexes every collection should have. Names are explicit so that
+# ensure_indexes() can verify them by name on later startups.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("id", ASCENDING)], unique=True, name="id_unique"),
+        IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+    ],
+    "events": [
+        IndexModel([("id", ASCENDING)], unique=True, name="id_unique"),
+        IndexModel([("coordinator_ids", ASCENDING)], name="coordinator_ids"),
+    ],
+    "colleges": [
+        IndexModel([("id", ASCENDING)], unique=True, name="id_unique"),
+        IndexModel([("total_points", DESCENDING)], name="total_points_desc"),
+    ],
+    "results": [
+        IndexModel([("id", ASCENDING)], unique=True, name="id_unique"),
+        # (timestamp, id) is the keyset used to paginate GET /api/results
+        IndexModel([("timestamp", DESCENDING), ("id", DESCENDING)], name="timestamp_id_desc"),
+        IndexModel([("event_id", ASCENDING), ("timestamp", DESCENDING), ("id", DESCENDING)],
+                   name="event_id_timestamp_id_desc"),
+        IndexModel([("college_id", ASCENDING), ("timestamp", DESCENDING), ("id", DESCENDING)],
+                   name="college_id_timestamp_id_desc"),
+    ],
+    "result_tombstones": [
+        # Replays select deletions by result timestamp or by deletion time
+        IndexModel([("timestamp", ASCENDING)], name="timestamp"),
+        IndexModel([("deleted_at", ASCENDING)], name="deleted_at"),
+    ],
+    "leaderboard_snapshots": [
+        IndexModel([("as_of", DESCENDING)], unique=True, name="as_of_unique"),
+    ],
+}
+
+# Query shapes issued by server.py: (collection, equality fields, sort).
+# Each shape should be served by a prefix of some index.
+QUERY_SHAPES: List[Tuple[str, Sequence[str], Sequence[Tuple[str, int]]]] = [
+    ("users", ["id"], []),
+    ("users", ["email"], []),
+    ("events", ["id"], []),
+    ("events", ["coordinator_ids"], []),
+    ("colleges", ["id"], []),
+    ("colleges", [], [("total_points", DESCENDING)]),
+    ("results", ["id"], []),
+    ("results", [], [("timestamp", DESCENDING), ("id", DESCENDING)]),
+    ("results", ["event_id"], [("timestamp", DESCENDING), ("id", DESCENDING)]),
+    ("results", ["college_id"], [("timestamp", DESCENDING), ("id", DESCENDING)]),
+    ("leaderboard_snapshots", [], [("as_of", DESCENDING)]),
+]
+
+
+def index_covers(keys: Sequence[Tuple[str, int]], equality: Sequence[str], sort: Sequence[Tuple[str, int]]) -> bool:
+    """True if an index with `keys` can serve the equality match and sort."""
+    fields = [field for field, _ in keys]
+    if len(fields) < len(equality) + len(sort):
+        return False
+    if set(fields[:len(equality)]) != set(equality):
+        return False
+    if not sort:
+        return True
+    tail = list(keys[len(equality):len(equality) + len(sort)])
+    if [field for field, _ in tail] != [field for field, _ in sort]:
+        return False
+    # An index can be walked in either direction, but all keys flip together
+    same = all(direction == wanted for (_, direction), (_, wanted) in zip(tail, sort))
+    reversed_ = all(direction == -wanted for (_, direction), (_, wanted) in zip(tail, sort))
+    return same or reversed_
+
+
+async def check_indexes(db) -> dict:
+    """Report missing or differing indexes and uncovered query shapes; read only."""
+    report = {"missing": [], "uncovered_queries": []}
+    existing: Dict[str, Dict[str, dict]] = {}
+
+    for collection, models in INDEXES.items():
+        existing[collection] = await db[collection].index_information()
+        for model in models:
+            spec = model.document
+            info = existing[collection].get(spec["name"])
+            if info is None or list(info["key"]) != list(spec["key"].items()) or \
+                    bool(info.get("unique")) != bool(spec.get("unique")):
+                report["missing"].append({"collection": collection, "index": spec["name"]})
+                logger.error(f"Index {collection}.{spec['name']} is missing or differs from its definition")
+
+    for collection, equality, sort in QUERY_SHAPES:
+        indexes = existing.get(collection) or {}
+        if not any(index_covers(list(info["key"]), equality, sort) for info in indexes.values()):
+            shape = {"collection": collection, "filter": list(equality), "sort": [list(s) for s in sort]}
+            report["uncovered_queries"].append(shape)
+            logger.warning(f"Query on {collection} filter={list(equality)} sort={list(sort)} is not covered by an index")
+
+    return report
+
+
+async def ensure_indexes(db) -> dict:
+    """Create missing indexes, then verify them and report uncovered query
+    shapes (see check_indexes).
+
+    Safe to run on every startup: create_indexes is a no-op for indexes that
+    already exist with the same definition.
+    """
+    report = {"created": {}, "errors": []}
+    for collection, models in INDEXES.items():
+        try:
+            report["created"][collection] = await db[collection].create_indexes(models)
+        except OperationFailure as e:
+            # e.g. duplicate ids/emails in old data, or a conflicting definition
+            logger.error(f"Could not create indexes on {collection}: {e}")
+            report["errors"].append({"collection": collection, "error": str(e)})
+    report.update(await check_indexes(db))
+    return report
@@ -0,0 +1,49 @@
+import json
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the standard library encoder
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional: MessagePack is only offered when installed
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack")
+MSGPACK_SUBPROTOCOL = "ignitron.msgpack"
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Compact UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def dumps(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def packb(obj: Any) -> bytes:
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def accepts_msgpack(accept: Optional[str]) -> bool:
+    """True if an Accept header lists a MessagePack media type (without q=0)
+    and msgpack is installed."""
+    if msgpack is None or not accept:
+        return False
+    for part in accept.split(","):
+        media_type, *params = [p.strip().lower() for p in part.split(";")]
+        if media_type in MSGPACK_MEDIA_TYPES:
+            quality = next((p[2:] for p in params if p.startswith("q=")), "1")
+            try:
+                return float(quality) > 0
+            except ValueError:
+                return False
+    return False
@@ -0,0 +1,109 @@
+from typing import Dict, Iterable, List, Optional
+from search import SearchIndex
+
+
+class EntityCache:
+    """In-process copy of a small, rarely changing collection (events,
+    colleges), keyed by id and by code.
+
+    Loaded once at startup and kept current with upsert()/remove(), which are
+    called for local writes and for changes other workers share through the
+    change feed. A lookup that misses falls back to the database (read-through)
+    so a document this worker has not heard about yet is still found.
+
+    With `search_fields`, the cached documents are also kept in a SearchIndex.
+    """
+
+    def __init__(self, db, collection: str, fields: Iterable[str], search_fields: Iterable[str] = ()):
+        self.db = db
+        self.collection = collection
+        self.projection = {"_id": 0, **{field: 1 for field in fields}}
+        self.hits = 0
+        self.misses = 0
+        self._by_id: Dict[str, dict] = {}
+        self._by_code: Dict[str, dict] = {}
+        search_fields = tuple(search_fields)
+        self.index: Optional[SearchIndex] = SearchIndex(search_fields) if search_fields else None
+
+    async def load(self):
+        docs = await self.db[self.collection].find({}, self.projection).to_list(None)
+        self._by_id = {}
+        self._by_code = {}
+        if self.index is not None:
+            self.index.clear()
+        for doc in docs:
+            self._store(doc)
+
+    def _store(self, doc: dict):
+        doc = {field: doc[field] for field in self.projection if field != "_id" and field in doc}
+        previous = self._by_id.get(doc["id"])
+        if previous is not None and self._by_code.get(previous.get("code")) is previous:
+            del self._by_code[previous["code"]]
+        self._by_id[doc["id"]] = doc
+        if doc.get("code") is not None:
+            self._by_code[doc["code"]] = doc
+        if self.index is not None:
+            self.index.add(doc)
+
+    def upsert(self, doc: dict):
+        self._store(doc)
+
+    def remove(self, entity_id: str):
+        doc = self._by_id.pop(entity_id, None)
+        if doc is not None and self._by_code.get(doc.get("code")) is doc:
+            del self._by_code[doc["code"]]
+        if self.index is not None:
+            self.index.remove(entity_id)
+
+    async def get(self, entity_id: str) -> Optional[dict]:
+        doc = self._by_id.get(entity_id)
+        if doc is not None:
+            self.hits += 1
+            return doc
+        self.misses += 1
+        doc = await self.db[self.collection].find_one({"id": entity_id}, self.projection)
+        if doc is not None:
+            self._store(doc)
+        return self._by_id.get(entity_id)
+
+    async def get_many(self, entity_ids: Iterable[str]) -> Dict[str, dict]:
+        """Documents for the ids that exist; all misses are read in one query."""
+        found: Dict[str, dict] = {}
+        missing: List[str] = []
+        for entity_id in set(entity_ids):
+            doc = self._by_id.get(entity_id)
+            if doc is not None:
+                found[entity_id] = doc
+            else:
+                missing.append(entity_id)
+        self.hits += len(found)
+        self.misses += len(missing)
+        if missing:
+            async for doc in self.db[self.collection].find({"id": {"$in": missing}}, self.projection):
+                self._store(doc)
+                found[doc["id"]] = self._by_id[doc["id"]]
+        return found
+
+    def get_by_code(self, code: str) -> Optional[dict]:
+        doc = self._by_code.get(code)
+        if doc is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return doc
+
+    def search(self, query: str, limit: int = 10) -> List[dict]:
+        """Ranked matches from memory only; see SearchIndex."""
+        return self.index.search(query, limit)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._by_id),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None
+        }
@@ -0,0 +1,159 @@
+from typing import Dict, Iterable, List, Optional
+from sortedcontainers import SortedList
+
+
+class LeaderboardIndex:
+    """In-memory standings kept in rank order.
+
+    Colleges are ordered by total points (highest first); ties are broken by
+    college code and then id so the order never depends on insertion order.
+    Point changes, rank lookups and top-K reads are O(log N).
+    """
+
+    def __init__(self):
+        self._colleges: Dict[str, dict] = {}
+        self._order = SortedList()
+
+    @staticmethod
+    def _key(college: dict):
+        return (-college["total_points"], college["code"], college["id"])
+
+    def load(self, colleges: Iterable[dict]):
+        self._colleges = {}
+        for college in colleges:
+            self._colleges[college["id"]] = {
+                "id": college["id"],
+                "name": college["name"],
+                "code": college["code"],
+                "total_points": college.get("total_points", 0)
+            }
+        self._order = SortedList(self._key(c) for c in self._colleges.values())
+
+    def add_college(self, college: dict):
+        if college["id"] in self._colleges:
+            self.remove_college(college["id"])
+        entry = {
+            "id": college["id"],
+            "name": college["name"],
+            "code": college["code"],
+            "total_points": college.get("total_points", 0)
+        }
+        self._colleges[entry["id"]] = entry
+        self._order.add(self._key(entry))
+
+    def remove_college(self, college_id: str) -> bool:
+        entry = self._colleges.pop(college_id, None)
+        if entry is None:
+            return False
+        self._order.remove(self._key(entry))
+        return True
+
+    def set_points(self, college_id: str, points: int) -> Optional[int]:
+        entry = self._colleges.get(college_id)
+        if entry is None:
+            return None
+        if entry["total_points"] != points:
+            self._order.remove(self._key(entry))
+            entry["total_points"] = points
+            self._order.add(self._key(entry))
+        return points
+
+    def apply_delta(self, college_id: str, delta: int) -> Optional[int]:
+        entry = self._colleges.get(college_id)
+        if entry is None:
+            return None
+        return self.set_points(college_id, entry["total_points"] + delta)
+
+    def get(self, college_id: str) -> Optional[dict]:
+        return self._colleges.get(college_id)
+
+    def rank_of(self, college_id: str) -> Optional[int]:
+        entry = self._colleges.get(college_id)
+        if entry is None:
+            return None
+        return self._order.index(self._key(entry)) + 1
+
+    def entry_for(self, college_id: str) -> Optional[dict]:
+        rank = self.rank_of(college_id)
+        if rank is None:
+            return None
+        return self._to_entry(rank, self._colleges[college_id])
+
+    def top(self, k: Optional[int] = None) -> List[dict]:
+        stop = None if k is None else max(k, 0)
+        leaderboard = []
+        for idx, key in enumerate(self._order.islice(0, stop), 1):
+            leaderboard.append(self._to_entry(idx, self._colleges[key[2]]))
+        return leaderboard
+
+    def entries(self) -> List[dict]:
+        return self.top()
+
+    @staticmethod
+    def _to_entry(rank: int, college: dict) -> dict:
+        return {
+            "rank": rank,
+            "college_name": college["name"],
+            "college_code": college["code"],
+            "total_points": college["total_points"]
+        }
+
+    def __len__(self):
+        return len(self._colleges)
+
+    def __contains__(self, college_id: str):
+        return college_id in self._colleges
+
+
+def diff_leaderboards(old: List[dict], new: List[dict]):
+    """Entries of `new` that differ from `old`, keyed by college code.
+
+    Returns (changed, removed). Changed entries always carry rank and points;
+    the college name is only included for colleges the client has not seen.
+    """
+    previous = {entry["college_code"]: entry for entry in old}
+    changed = []
+    for entry in new:
+        before = previous.pop(entry["college_code"], None)
+        if before is None or before["college_name"] != entry["college_name"]:
+            changed.append(dict(entry))
+        elif before["rank"] != entry["rank"] or before["total_points"] != entry["total_points"]:
+            changed.append({
+                "college_code": entry["college_code"],
+                "rank": entry["rank"],
+                "total_points": entry["total_points"]
+            })
+    return changed, list(previous)
+
+
+class CollegeIds:
+    """Small integer ids for college codes, used by the compact wire format.
+
+    Ids are assigned on first sight and never reused while the process runs,
+    so a client keeps the names it was sent once and later frames only carry
+    the id.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+
+    def id_for(self, code: str) -> int:
+        return self._ids.setdefault(code, len(self._ids))
+
+
+def compact_snapshot(entries: List[dict], ids: CollegeIds) -> dict:
+    """Leaderboard as a college dictionary plus [id, points] rows in rank order."""
+    return {
+        "colleges": [[ids.id_for(e["college_code"]), e["college_name"], e["college_code"]] for e in entries],
+        "rows": [[ids.id_for(e["college_code"]), e["total_points"]] for e in entries]
+    }
+
+
+def compact_delta(changed: List[dict], removed: List[str], ids: CollegeIds) -> dict:
+    """diff_leaderboards output by college id; names only for new or renamed colleges."""
+    return {
+        "colleges": [[ids.id_for(e["college_code"]), e["college_name"], e["college_code"]]
+                     for e in changed if "college_name" in e],
+        "changed": [[ids.id_for(e["college_code"]), e["rank"], e["total_points"]] for e in changed],
+        "removed": [ids.id_for(code) for code in removed]
+    }
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone, timedelta
+from typing import Dict, List, Optional
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+
+class PointsReconciler:
+    """Recomputes college totals from `results` and repairs `colleges.total_points`.
+
+    Results up to a high-water mark on `timestamp` are summed once and kept as a
+    baseline; each later pass only aggregates results recorded since then.
+    Deleted results are subtracted from the baseline through note_deleted(),
+    called inside deleting(). A delete that overlaps a pass's sum may or may
+    not have been counted, so the baseline is marked stale instead; so is it
+    by invalidate(), e.g. for deletes made by another worker. A stale baseline
+    makes the next pass full and the current one not repair.
+
+    The baseline only finds candidates: a result that becomes visible after
+    the high-water mark passed its timestamp (a slow insert, a retried write)
+    is missing from it. Drift is only repaired if it is still the same after
+    `confirm_delay` seconds, so that a result insert whose $inc has not landed
+    yet is not mistaken for drift, and if a full sum over the drifted colleges'
+    results agrees with the baseline. Each repair is an $inc conditioned on the
+    total it observed, so a concurrent write is never overwritten.
+    """
+
+    def __init__(self, db, settle_seconds: float = 5.0, confirm_delay: float = 1.0):
+        self.db = db
+        self.settle_seconds = settle_seconds
+        self.confirm_delay = confirm_delay
+        self.high_water_mark: Optional[str] = None
+        self.last_report: Optional[dict] = None
+        self._baseline: Dict[str, int] = {}
+        self._stale = False
+        self._deleting = 0  # deletes in progress
+        self._deletes = 0  # deletes started
+        self._lock = asyncio.Lock()  # one pass at a time
+        self._task: Optional[asyncio.Task] = None
+
+    def invalidate(self):
+        self._stale = True
+
+    @asynccontextmanager
+    async def deleting(self):
+        self._deleting += 1
+        self._deletes += 1
+        try:
+            yield
+        finally:
+            self._deleting -= 1
+
+    def note_deleted(self, result: dict):
+        if self.high_water_mark is None or self._stale:
+            return
+        timestamp = result.get("timestamp")
+        if timestamp is None:
+            self.invalidate()
+        elif timestamp <= self.high_water_mark:
+            college_id = result["college_id"]
+            self._baseline[college_id] = self._baseline.get(college_id, 0) - result["points"]
+
+    async def _sum_points(self, match: dict) -> Dict[str, int]:
+        pipeline = [
+            {"$match": match},
+            {"$group": {"_id": "$college_id", "points": {"$sum": "$points"}}}
+        ]
+        return {row["_id"]: row["points"] async for row in self.db.results.aggregate(pipeline)}
+
+    async def _expected_totals(self) -> Dict[str, int]:
+        recent = await self._sum_points({"timestamp": {"$gt": self.high_water_mark}})
+        expected = dict(self._baseline)
+        for college_id, points in recent.items():
+            expected[college_id] = expected.get(college_id, 0) + points
+        return expected
+
+    async def _find_drift(self, college_ids: Optional[List[str]] = None) -> Dict[str, tuple]:
+        expected = await self._expected_totals()
+        query = {"id": {"$in": college_ids}} if college_ids is not None else {}
+        drift = {}
+        async for college in self.db.colleges.find(query, {"_id": 0, "id": 1, "total_points": 1}):
+            actual = college.get("total_points", 0)
+            want = expected.get(college["id"], 0)
+            if actual != want:
+                drift[college["id"]] = (actual, want)
+        return drift
+
+    async def run(self, full: bool = False, repair: bool = True) -> dict:
+        async with self._lock:
+            mode = "full" if full or self._stale or self.high_water_mark is None else "incremental"
+            new_mark = (datetime.now(timezone.utc) - timedelta(seconds=self.settle_seconds)).isoformat()
+            overlapped, deletes = self._deleting > 0, self._deletes
+            if mode == "full":
+                self._stale = False
+                self._baseline = await self._sum_points({"timestamp": {"$lte": new_mark}})
+            elif new_mark > self.high_water_mark:
+                tail = await self._sum_points({"timestamp": {"$gt": self.high_water_mark, "$lte": new_mark}})
+                for college_id, points in tail.items():
+                    self._baseline[college_id] = self._baseline.get(college_id, 0) + points
+            self.high_water_mark = max(new_mark, self.high_water_mark or new_mark)
+            if overlapped or self._deletes != deletes:
+                self.invalidate()
+
+            drift = await self._find_drift()
+            if drift and self.confirm_delay > 0:
+                await asyncio.sleep(self.confirm_delay)
+                confirmed = await self._find_drift(list(drift))
+                drift = {cid: d for cid, d in confirmed.items() if drift.get(cid) == d}
+
+            # A delete of unknown order arrived meanwhile; the drift may be ours
+            inconclusive = self._stale
+            unverified: List[str] = []
+            if drift and not inconclusive:
+                exact = await self._sum_points({"college_id": {"$in": list(drift)}})
+                unverified = [cid for cid, (actual, want) in drift.items() if exact.get(cid, 0) != want]
+                if unverified:
+                    # The baseline missed or double-counted something
+                    self.invalidate()
+                    drift = {cid: d for cid, d in drift.items() if cid not in unverified}
+
+            repaired = 0
+            if repair and drift and not inconclusive:
+                result = await self.db.colleges.bulk_write([
+                    UpdateOne({"id": college_id, "total_points": actual}, {"$inc": {"total_points": want - actual}})
+                    for college_id, (actual, want) in drift.items()
+                ], ordered=False)
+                repaired = result.modified_count
+
+            report = {
+                "mode": mode,
+                "high_water_mark": self.high_water_mark,
+                "drifted": [
+                    {"college_id": cid, "total_points": actual, "expected_points": want}
+                    for cid, (actual, want) in drift.items()
+                ],
+                "unverified": unverified,
+                "repaired": repaired,
+                "inconclusive": inconclusive,
+                "dry_run": not repair,
+                "finished_at": datetime.now(timezone.utc).isoformat()
+            }
+            if unverified:
+                logger.info(f"Reconcile ({mode}) baseline disagreed with results for {len(unverified)} colleges, "
+                            f"next pass is full")
+            if drift:
+                logger.warning(f"Reconcile ({mode}) found {len(drift)} drifted college totals, repaired {repaired}")
+            self.last_report = report
+            return report
+
+    def start_periodic(self, interval: float, on_report=None):
+        async def loop():
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    report = await self.run()
+                    if on_report is not None:
+                        await on_report(report)
+                except Exception:
+                    logger.exception("Periodic reconcile failed")
+        if self._task is None and interval > 0:
+            self._task = asyncio.create_task(loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
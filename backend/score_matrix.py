@@ -0,0 +1,105 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+
+class ScoreMatrix:
+    """Points per (event, college), kept as a dense int64 matrix.
+
+    Events and colleges are mapped to row/column ordinals. Removing one only
+    drops it from the mapping; its row or column is zeroed and not reused, so
+    ordinals stay stable for the life of the process.
+    """
+
+    def __init__(self):
+        self.events: Dict[str, int] = {}
+        self.colleges: Dict[str, int] = {}
+        self.event_info: Dict[str, dict] = {}
+        self.college_info: Dict[str, dict] = {}
+        self._event_ids: List[Optional[str]] = []
+        self._college_ids: List[Optional[str]] = []
+        self.points = np.zeros((8, 8), dtype=np.int64)
+
+    def _grow(self, rows: int, cols: int):
+        cur_rows, cur_cols = self.points.shape
+        if rows <= cur_rows and cols <= cur_cols:
+            return
+        new_rows = cur_rows if rows <= cur_rows else max(rows, cur_rows * 2)
+        new_cols = cur_cols if cols <= cur_cols else max(cols, cur_cols * 2)
+        grown = np.zeros((new_rows, new_cols), dtype=np.int64)
+        grown[:cur_rows, :cur_cols] = self.points
+        self.points = grown
+
+    def load(self, events: Iterable[dict], colleges: Iterable[dict], cells: Iterable[Tuple[str, str, int]]):
+        self.__init__()
+        for event in events:
+            self.add_event(event["id"], event)
+        for college in colleges:
+            self.add_college(college["id"], college)
+        for event_id, college_id, points in cells:
+            self.add(event_id, college_id, points)
+
+    def add_event(self, event_id: str, info: Optional[dict] = None):
+        if event_id not in self.events:
+            self.events[event_id] = len(self._event_ids)
+            self._event_ids.append(event_id)
+            self._grow(len(self._event_ids), self.points.shape[1])
+        self.event_info[event_id] = {"id": event_id, "title": (info or {}).get("title"), "code": (info or {}).get("code")}
+
+    def add_college(self, college_id: str, info: Optional[dict] = None):
+        if college_id not in self.colleges:
+            self.colleges[college_id] = len(self._college_ids)
+            self._college_ids.append(college_id)
+            self._grow(self.points.shape[0], len(self._college_ids))
+        self.college_info[college_id] = {"id": college_id, "name": (info or {}).get("name"), "code": (info or {}).get("code")}
+
+    def remove_event(self, event_id: str):
+        row = self.events.pop(event_id, None)
+        if row is not None:
+            self.points[row, :] = 0
+            self._event_ids[row] = None
+            self.event_info.pop(event_id, None)
+
+    def remove_college(self, college_id: str):
+        col = self.colleges.pop(college_id, None)
+        if col is not None:
+            self.points[:, col] = 0
+            self._college_ids[col] = None
+            self.college_info.pop(college_id, None)
+
+    def add(self, event_id: str, college_id: str, delta: int) -> bool:
+        """Apply a points change; ignored (False) for unknown events or colleges."""
+        row = self.events.get(event_id)
+        col = self.colleges.get(college_id)
+        if row is None or col is None:
+            return False
+        self.points[row, col] += delta
+        return True
+
+    def event_standings(self, event_id: str) -> Optional[List[Tuple[str, int]]]:
+        """(college_id, points) for colleges that scored in the event, best first."""
+        row = self.events.get(event_id)
+        if row is None:
+            return None
+        scores = self.points[row, :len(self._college_ids)]
+        cols = np.flatnonzero(scores)
+        order = cols[np.argsort(-scores[cols], kind="stable")]
+        return [(self._college_ids[c], int(scores[c])) for c in order]
+
+    def college_breakdown(self, college_id: str) -> Optional[List[Tuple[str, int]]]:
+        """(event_id, points) for every event the college scored in, best first."""
+        col = self.colleges.get(college_id)
+        if col is None:
+            return None
+        scores = self.points[:len(self._event_ids), col]
+        rows = np.flatnonzero(scores)
+        order = rows[np.argsort(-scores[rows], kind="stable")]
+        return [(self._event_ids[r], int(scores[r])) for r in order]
+
+    def export(self) -> dict:
+        rows = [self.events[e] for e in self._event_ids if e is not None]
+        cols = [self.colleges[c] for c in self._college_ids if c is not None]
+        return {
+            "events": [self.event_info[self._event_ids[r]] for r in rows],
+            "colleges": [self.college_info[self._college_ids[c]] for c in cols],
+            "points": self.points[np.ix_(rows, cols)].tolist()
+        }
@@ -0,0 +1,207 @@
+import heapq
+import re
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+from sortedcontainers import SortedList
+
+_WORD = re.compile(r"[^\W_]+")
+
+Key = Tuple[int, str, str]  # (length of the first field, first field, id): shorter names rank first
+
+
+def tokenize(text) -> List[str]:
+    return _WORD.findall(str(text or "").casefold())
+
+
+def _grams(word: str) -> Set[str]:
+    padded = f" {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """In-memory prefix and typo-tolerant search over a few text fields.
+
+    Text is case-folded and split into words. A query matches, best first:
+
+        0. a field equal to the query ("kleit" -> code KLEIT)
+        1. a field starting with the query ("kle eng" -> "KLE Engineering, Belgaum")
+        2. every query word a prefix of some word (any order: "hubli kle")
+        3. the same, with words that prefix nothing matched to similar
+           indexed words instead ("belgam" -> "belgaum")
+
+    and within a tier shorter names first. Posting lists, keyed by field and
+    word prefixes of up to `prefix_length` characters, are kept in that order,
+    so a search walks them until it has `limit` hits instead of scoring every
+    candidate.
+    """
+
+    def __init__(self, fields: Sequence[str], prefix_length: int = 6, min_similarity: float = 0.5):
+        self.fields = tuple(fields)
+        self.prefix_length = prefix_length
+        self.min_similarity = min_similarity
+        self.clear()
+
+    def clear(self):
+        self._docs: Dict[str, dict] = {}
+        self._keys: Dict[str, Key] = {}
+        self._texts: Dict[str, Tuple[str, ...]] = {}
+        self._words: Dict[str, Tuple[str, ...]] = {}
+        self._exact: Dict[str, Set[str]] = {}
+        self._starts: Dict[str, SortedList] = {}  # field prefix -> keys
+        self._word_prefixes: Dict[str, SortedList] = {}  # word prefix -> keys
+        self._vocabulary: Dict[str, SortedList] = {}  # word -> keys
+        self._sorted_words = SortedList()
+        self._grams: Dict[str, Set[str]] = {}  # trigram -> words
+
+    def _prefixes(self, text: str) -> Iterable[str]:
+        return (text[:n] for n in range(1, min(len(text), self.prefix_length) + 1))
+
+    def _postings(self, texts: Tuple[str, ...], words: Tuple[str, ...]) -> Iterable[Tuple[Dict, str]]:
+        """(posting index, name) pairs a doc with these texts and words is listed under."""
+        for prefix in {p for text in texts for p in self._prefixes(text)}:
+            yield self._starts, prefix
+        for prefix in {p for word in words for p in self._prefixes(word)}:
+            yield self._word_prefixes, prefix
+        for word in words:
+            yield self._vocabulary, word
+
+    def _register(self, doc: dict) -> Key:
+        doc_id = doc["id"]
+        texts = tuple(" ".join(tokenize(doc.get(field))) for field in self.fields)
+        words = tuple(sorted({word for text in texts for word in text.split()}))
+        key = (len(texts[0]), texts[0], doc_id)
+        self._docs[doc_id] = doc
+        self._keys[doc_id] = key
+        self._texts[doc_id] = texts
+        self._words[doc_id] = words
+        for text in set(texts):
+            if text:
+                self._exact.setdefault(text, set()).add(doc_id)
+        for word in words:
+            if word not in self._vocabulary:
+                self._vocabulary[word] = SortedList()
+                self._sorted_words.add(word)
+                for gram in _grams(word):
+                    self._grams.setdefault(gram, set()).add(word)
+        return key
+
+    def load(self, docs: Iterable[dict]):
+        self.clear()
+        pending: Dict[Tuple[int, str], Tuple[Dict, str, List[Key]]] = {}
+        for doc in docs:
+            if doc["id"] in self._docs:
+                continue
+            key = self._register(doc)
+            doc_id = doc["id"]
+            for index, name in self._postings(self._texts[doc_id], self._words[doc_id]):
+                pending.setdefault((id(index), name), (index, name, []))[2].append(key)
+        # One sort per posting list instead of one insertion per key
+        for index, name, keys in pending.values():
+            index[name] = SortedList(keys)
+
+    def add(self, doc: dict):
+        self.remove(doc["id"])
+        key = self._register(doc)
+        for index, name in self._postings(self._texts[doc["id"]], self._words[doc["id"]]):
+            index.setdefault(name, SortedList()).add(key)
+
+    def remove(self, doc_id: str):
+        if self._docs.pop(doc_id, None) is None:
+            return
+        key = self._keys.pop(doc_id)
+        texts = self._texts.pop(doc_id)
+        words = self._words.pop(doc_id)
+
+        def discard(index: Dict, name: str, item):
+            items = index.get(name)
+            if items is not None:
+                items.discard(item)
+                if not items:
+                    del index[name]
+
+        for text in set(texts):
+            discard(self._exact, text, doc_id)
+        for index, name in self._postings(texts, words):
+            discard(index, name, key)
+        for word in words:
+            if word not in self._vocabulary:
+                self._sorted_words.discard(word)
+                for gram in _grams(word):
+                    discard(self._grams, gram, word)
+
+    def _prefixes_any_word(self, prefix: str) -> bool:
+        i = self._sorted_words.bisect_left(prefix)
+        return i < len(self._sorted_words) and self._sorted_words[i].startswith(prefix)
+
+    def _has_prefixed(self, doc_id: str, prefix: str) -> bool:
+        return any(word.startswith(prefix) for word in self._words[doc_id])
+
+    def _similar_words(self, word: str) -> Set[str]:
+        grams = _grams(word)
+        shared: Dict[str, int] = {}
+        for gram in grams:
+            for other in self._grams.get(gram, ()):
+                shared[other] = shared.get(other, 0) + 1
+        # Dice coefficient over trigrams; one wrong or missing letter in a
+        # word of five or more letters keeps at least half of them
+        return {
+            other for other, count in shared.items()
+            if 2 * count / (len(grams) + len(other)) >= self.min_similarity
+        }
+
+    def search(self, query: str, limit: int = 10) -> List[dict]:
+        words = tokenize(query)
+        if not words or limit <= 0:
+            return []
+        phrase = " ".join(words)
+        hits: List[str] = []
+        seen: Set[str] = set()
+
+        def take(keys: Iterable[Key], predicate=None) -> bool:
+            for key in keys:
+                doc_id = key[2]
+                if doc_id in seen or (predicate is not None and not predicate(doc_id)):
+                    continue
+                seen.add(doc_id)
+                hits.append(doc_id)
+                if len(hits) >= limit:
+                    return True
+            return False
+
+        def result() -> List[dict]:
+            return [self._docs[doc_id] for doc_id in hits]
+
+        if take(sorted(self._keys[doc_id] for doc_id in self._exact.get(phrase, ()))):
+            return result()
+        # A posting list holds every doc sharing the first `prefix_length`
+        # characters, so only longer queries need checking
+        n = self.prefix_length
+        if take(self._starts.get(phrase[:n], ()),
+                (lambda doc_id: any(text.startswith(phrase) for text in self._texts[doc_id]))
+                if len(phrase) > n else None):
+            return result()
+
+        typos = [word for word in words if not self._prefixes_any_word(word)]
+        if not typos:
+            shortest = min((self._word_prefixes.get(word[:n], ()) for word in words), key=len)
+            take(shortest, (lambda doc_id: all(self._has_prefixed(doc_id, word) for word in words))
+                 if len(words) > 1 or len(words[0]) > n else None)
+            return result()
+
+        similar = {word: self._similar_words(word) for word in typos if len(word) >= 3}
+        if len(similar) < len(typos) or not all(similar.values()):
+            return result()
+
+        def matches(doc_id: str) -> bool:
+            return all(
+                any(w in similar[word] for w in self._words[doc_id]) if word in similar
+                else self._has_prefixed(doc_id, word)
+                for word in words
+            )
+
+        # Walk the docs of the rarest misspelled word in rank order
+        rarest = min(typos, key=lambda word: sum(len(self._vocabulary[w]) for w in similar[word]))
+        take(heapq.merge(*(self._vocabulary[w] for w in similar[rarest])), matches)
+        return result()
+
+    def __len__(self):
+        return len(self._docs)
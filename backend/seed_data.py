@@ -1,11 +1,16 @@
+import argparse
 import asyncio
+import time
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 from dotenv import load_dotenv
 from pathlib import Path
 from passlib.context import CryptContext
+from db_indexes import ensure_indexes
 import uuid
-from datetime import datetime, timezone
+import random
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone, timedelta
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -99,6 +104,117 @@ ACHIEVEMENT_STATEMENTS = [
     "Achieved excellence in technical dance performance"
 ]
 
+POINT_CHOICES = [50, 100, 150, 200, 250, 300]
+
+def _numbered(names, i):
+    """Cycle through `names`, numbering repeats once the list is exhausted."""
+    name = names[i % len(names)]
+    return name if i < len(names) else f"{name} #{i // len(names) + 1}"
+
+def hash_in_pool(passwords, workers=None):
+    """Hash `passwords` with bcrypt across a process pool."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(hash_password, passwords, chunksize=8))
+
+def generate_fixture(colleges=len(COLLEGE_NAMES), events=len(EVENT_NAMES), results=15, seed=None,
+                     shared_password=None, hash_fn=hash_password, hash_many=None):
+    """Build users, events, colleges and results documents in memory.
+
+    With a `seed` the fixture (ids, timestamps, picks) is fully reproducible.
+    `shared_password` gives every coordinator the same password so it is
+    hashed only once, which benchmarks use to avoid hundreds of bcrypt rounds.
+    Passwords are hashed together at the end, by `hash_many(passwords)` if
+    given (e.g. hash_in_pool) or else one by one with `hash_fn`.
+    College totals are precomputed from the generated results.
+    """
+    rng = random.Random(seed)
+
+    def new_id():
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    now = datetime.now(timezone.utc) if seed is None else datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    admin_password = "admin123"
+    users = [{
+        "id": new_id(),
+        "username": "Admin",
+        "email": "admin@ignitron.com",
+        "password_hash": admin_password,
+        "role": "admin",
+        "event_ids": [],
+        "created_at": now.isoformat()
+    }]
+    credentials = [{"role": "admin", "email": "admin@ignitron.com", "password": admin_password}]
+
+    event_docs = []
+    for i in range(events):
+        coordinator_id = new_id()
+        event_doc = {
+            "id": new_id(),
+            "title": _numbered(EVENT_NAMES, i),
+            "code": f"EVENT{i + 1:02d}",
+            "coordinator_ids": [coordinator_id]
+        }
+        event_docs.append(event_doc)
+
+        password = shared_password or f"coord{i + 1}123"
+        users.append({
+            "id": coordinator_id,
+            "username": f"Coordinator {i + 1}",
+            "email": f"coordinator{i + 1}@ignitron.com",
+            "password_hash": password,
+            "role": "coordinator",
+            "event_ids": [event_doc["id"]],
+            "created_at": now.isoformat()
+        })
+        credentials.append({
+            "role": "coordinator",
+            "number": i + 1,
+            "event": event_doc["title"],
+            "event_id": event_doc["id"],
+            "email": f"coordinator{i + 1}@ignitron.com",
+            "password": password
+        })
+
+    college_docs = [{
+        "id": new_id(),
+        "name": _numbered(COLLEGE_NAMES, i),
+        "code": f"CLG{i + 1:02d}",
+        "total_points": 0
+    } for i in range(colleges)]
+
+    # Results are spread one second apart, ending now
+    result_docs = []
+    for i in range(results if event_docs and college_docs else 0):
+        event_doc = rng.choice(event_docs)
+        college_doc = rng.choice(college_docs)
+        points = rng.choice(POINT_CHOICES)
+        result_docs.append({
+            "id": new_id(),
+            "event_id": event_doc["id"],
+            "college_id": college_doc["id"],
+            "points": points,
+            "achievement_statement": rng.choice(ACHIEVEMENT_STATEMENTS),
+            "recorded_by": event_doc["coordinator_ids"][0],
+            "timestamp": (now - timedelta(seconds=results - i)).isoformat()
+        })
+        college_doc["total_points"] += points
+
+    # password_hash holds the plain password until here
+    passwords = list(dict.fromkeys(user["password_hash"] for user in users))
+    hashes = hash_many(passwords) if hash_many else [hash_fn(p) for p in passwords]
+    hashed = dict(zip(passwords, hashes))
+    for user in users:
+        user["password_hash"] = hashed[user["password_hash"]]
+
+    return {
+        "users": users,
+        "events": event_docs,
+        "colleges": college_docs,
+        "results": result_docs,
+        "credentials": credentials
+    }
+
 async def seed_database():
     print("\n" + "="*60)
     print("IGNITRON 2K25 - Database Seeding")
@@ -110,6 +226,9 @@ async def seed_database():
     await db.events.delete_many({})
     await db.colleges.delete_many({})
     await db.results.delete_many({})
+    # Snapshots and tombstones describe the old results log
+    await db.leaderboard_snapshots.delete_many({})
+    await db.result_tombstones.delete_many({})
     print("✓ Cleared\n")
     
     # Create Admin
@@ -261,6 +380,64 @@ async def seed_database():
         print(f"{idx:<6} {college['name']:<30} {college['total_points']:<10}")
     print("-" * 60)
 
+async def seed_bulk(colleges, events, results, seed=None, workers=None, chunk_size=10000):
+    """Seed a fixture of any size: documents are built in memory, each collection
+    is written with unordered insert_many batches, and indexes are built last."""
+    print("\n" + "="*60)
+    print("IGNITRON 2K25 - Bulk Database Seeding")
+    print("="*60 + "\n")
+    started = time.perf_counter()
+
+    print(f"Generating {colleges} colleges, {events} events, {results} results (seed={seed})...")
+    fixture = generate_fixture(colleges=colleges, events=events, results=results, seed=seed,
+                               hash_many=lambda passwords: hash_in_pool(passwords, workers))
+    print(f"✓ Generated in {time.perf_counter() - started:.1f}s\n")
+
+    # Dropping also drops the indexes, so inserts don't maintain them row by row
+    print("Dropping existing collections...")
+    for name in ("users", "events", "colleges", "results", "leaderboard_snapshots", "result_tombstones"):
+        await db[name].drop()
+    print("✓ Dropped\n")
+
+    for name in ("users", "events", "colleges", "results"):
+        loaded = time.perf_counter()
+        docs = fixture[name]
+        for start in range(0, len(docs), chunk_size):
+            await db[name].insert_many(docs[start:start + chunk_size], ordered=False)
+        print(f"✓ Inserted {len(docs)} {name} in {time.perf_counter() - loaded:.1f}s")
+
+    print("\nBuilding indexes...")
+    report = await ensure_indexes(db)
+    created = sum(len(names) for names in report['created'].values())
+    print(f"✓ Created {created} indexes on {len(report['created'])} collections\n")
+
+    print("="*60)
+    print(f"Bulk seeding complete in {time.perf_counter() - started:.1f}s")
+    print("="*60 + "\n")
+    print(f"   Admin: admin@ignitron.com / admin123")
+    print(f"   Coordinator N: coordinatorN@ignitron.com / coordN123 (N = 1..{events})\n")
+
 if __name__ == "__main__":
-    asyncio.run(seed_database())
+    parser = argparse.ArgumentParser(description="Seed the IGNITRON database")
+    parser.add_argument("--bulk", action="store_true",
+                        help="build the fixture in memory and load it with insert_many")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiply the default colleges/events/results counts (bulk mode)")
+    parser.add_argument("--colleges", type=int, help="number of colleges (bulk mode)")
+    parser.add_argument("--events", type=int, help="number of events and coordinators (bulk mode)")
+    parser.add_argument("--results", type=int, help="number of results (bulk mode)")
+    parser.add_argument("--seed", type=int, help="RNG seed for a reproducible fixture (bulk mode)")
+    parser.add_argument("--workers", type=int, help="processes used to hash passwords (bulk mode)")
+    args = parser.parse_args()
+
+    if args.bulk:
+        asyncio.run(seed_bulk(
+            colleges=args.colleges if args.colleges is not None else round(len(COLLEGE_NAMES) * args.scale),
+            events=args.events if args.events is not None else round(len(EVENT_NAMES) * args.scale),
+            results=args.results if args.results is not None else round(15 * args.scale),
+            seed=args.seed,
+            workers=args.workers
+        ))
+    else:
+        asyncio.run(seed_database())
     print("Database seeding completed successfully!")
\ No newline at end of file
@@ -1,26 +1,68 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, WebSocket, WebSocketDisconnect, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, Request, Response, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from starlette.background import BackgroundTask
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import asyncio
 import logging
+import time
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable
 import uuid
 from datetime import datetime, timezone, timedelta
-from passlib.context import CryptContext
 import jwt
 from bson import ObjectId
+from pymongo import UpdateOne
 import json
+import base64
+import csv
+import io
+import math
+from collections import deque
+from leaderboard import LeaderboardIndex, CollegeIds, compact_delta, compact_snapshot, diff_leaderboards
+from cache import TTLCache, VersionedResponseCache
+from db_indexes import check_indexes, ensure_indexes
+from score_matrix import ScoreMatrix
+from encoding import MSGPACK_MEDIA_TYPE, MSGPACK_SUBPROTOCOL, accepts_msgpack, dumps_bytes, msgpack, packb
+from broadcast import RecentKeys, create_backend
+from reconcile import PointsReconciler
+from snapshots import LeaderboardHistory
+from entities import EntityCache
+from passwords import PasswordHasher, PasswordHasherBusy
+from admission import AdmissionRejected, ConcurrencyGate, GateSlot, RateLimiter, create_limiter_store
+from metrics import Registry, MongoCommandMetrics, RouteMetricsMiddleware
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Metrics, exposed in Prometheus text format at /metrics
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+metrics = Registry()
+http_request_duration = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route"))
+http_responses = metrics.counter(
+    "http_responses_total", "HTTP responses by route template and status code", ("method", "route", "status"))
+mongo_command_duration = metrics.histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency by command and collection", ("command", "collection"))
+mongo_command_failures = metrics.counter(
+    "mongo_command_failures_total", "Failed MongoDB commands by command and collection", ("command", "collection"))
+password_queue_wait = metrics.histogram(
+    "password_hash_queue_wait_seconds", "Time bcrypt work waited for a free hashing slot")
+leaderboard_recompute_duration = metrics.histogram(
+    "leaderboard_recompute_seconds", "Time to build, diff and encode a leaderboard publish")
+broadcast_fanout_duration = metrics.histogram(
+    "broadcast_fanout_seconds", "Time to queue one broadcast frame for every socket in a room", ("room",))
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url,
+    event_listeners=[MongoCommandMetrics(mongo_command_duration, mongo_command_failures)] if METRICS_ENABLED else []
+)
 db = client[os.environ['DB_NAME']]
 
 # JWT Configuration
@@ -28,39 +70,554 @@ SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'ignitron-2k25-secret-key-change-i
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Authenticated principals are cached per user id. With TRUST_TOKEN_CLAIMS
+# enabled, tokens younger than TOKEN_CLAIMS_MAX_AGE_SECONDS are trusted as-is.
+PRINCIPAL_CACHE_SIZE = int(os.environ.get('PRINCIPAL_CACHE_SIZE', '1024'))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.environ.get('PRINCIPAL_CACHE_TTL_SECONDS', '60'))
+TRUST_TOKEN_CLAIMS = os.environ.get('TRUST_TOKEN_CLAIMS', 'false').lower() == 'true'
+TOKEN_CLAIMS_MAX_AGE_SECONDS = int(os.environ.get('TOKEN_CLAIMS_MAX_AGE_SECONDS', '300'))
+
+RESULT_BATCH_MAX_SIZE = int(os.environ.get('RESULT_BATCH_MAX_SIZE', '200'))
+RESULTS_PAGE_MAX_SIZE = 1000
+RESULTS_STREAM_BATCH_SIZE = int(os.environ.get('RESULTS_STREAM_BATCH_SIZE', '500'))
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', '1000'))
+DASHBOARD_RESULTS_LIMIT = int(os.environ.get('DASHBOARD_RESULTS_LIMIT', '1000'))
+# Incremental dashboard refreshes re-send results this close to the previous
+# version, so a write that committed late is never missed
+DASHBOARD_SETTLE_SECONDS = float(os.environ.get('DASHBOARD_SETTLE_SECONDS', '5'))
+
+# Password hashing runs in a bounded worker pool so bcrypt never blocks the event loop
+PASSWORD_HASH_CONCURRENCY = int(os.environ.get('PASSWORD_HASH_CONCURRENCY', '4'))
+PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS = float(os.environ.get('PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS', '5'))
+PASSWORD_HASH_USE_PROCESSES = os.environ.get('PASSWORD_HASH_USE_PROCESSES', 'false').lower() == 'true'
+password_hasher = PasswordHasher(
+    max_concurrency=PASSWORD_HASH_CONCURRENCY,
+    queue_timeout=PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS,
+    use_processes=PASSWORD_HASH_USE_PROCESSES
+)
+password_hasher.on_queue_wait = password_queue_wait.observe
+
+# Admission control: token buckets per principal and route class (login per
+# client IP and email), and a cap on expensive requests in flight. Both answer 429 with
+# Retry-After rather than queuing work.
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+RATE_LIMIT_STORE_URL = os.environ.get('RATE_LIMIT_STORE_URL', 'local')  # local or redis://...
+RATE_LIMIT_LOGIN_PER_MINUTE = float(os.environ.get('RATE_LIMIT_LOGIN_PER_MINUTE', '30'))
+RATE_LIMIT_LOGIN_BURST = float(os.environ.get('RATE_LIMIT_LOGIN_BURST', '20'))
+RATE_LIMIT_RESULTS_PER_MINUTE = float(os.environ.get('RATE_LIMIT_RESULTS_PER_MINUTE', '120'))
+RATE_LIMIT_RESULTS_BURST = float(os.environ.get('RATE_LIMIT_RESULTS_BURST', '30'))
+RATE_LIMIT_ADMIN_PER_MINUTE = float(os.environ.get('RATE_LIMIT_ADMIN_PER_MINUTE', '120'))
+RATE_LIMIT_ADMIN_BURST = float(os.environ.get('RATE_LIMIT_ADMIN_BURST', '30'))
+EXPENSIVE_ROUTE_CONCURRENCY = int(os.environ.get('EXPENSIVE_ROUTE_CONCURRENCY', '8'))  # 0 disables
+rate_limiter = RateLimiter(create_limiter_store(RATE_LIMIT_STORE_URL), {
+    "login": (RATE_LIMIT_LOGIN_PER_MINUTE / 60, RATE_LIMIT_LOGIN_BURST),
+    "results": (RATE_LIMIT_RESULTS_PER_MINUTE / 60, RATE_LIMIT_RESULTS_BURST),
+    "admin": (RATE_LIMIT_ADMIN_PER_MINUTE / 60, RATE_LIMIT_ADMIN_BURST)
+} if RATE_LIMIT_ENABLED else {})
+expensive_gate = ConcurrencyGate(EXPENSIVE_ROUTE_CONCURRENCY)
 security = HTTPBearer()
+principal_cache = TTLCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL_SECONDS)
 
 # Create the main app
 app = FastAPI(title="IGNITRON 2K25 API")
 api_router = APIRouter(prefix="/api")
 
 # WebSocket Manager
+WS_SEND_QUEUE_SIZE = int(os.environ.get('WS_SEND_QUEUE_SIZE', '8'))
+WS_SEND_TIMEOUT_SECONDS = float(os.environ.get('WS_SEND_TIMEOUT_SECONDS', '5'))
+WS_SLOW_CLIENT_POLICY = os.environ.get('WS_SLOW_CLIENT_POLICY', 'resync')  # resync, drop
+
+class Subscriber:
+    """A connected socket with its own bounded send queue and writer task."""
+    def __init__(self, websocket: WebSocket, room: str, max_queue: int):
+        self.websocket = websocket
+        self.room = room
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.writer: Optional[asyncio.Task] = None
+        self.dropped = 0
+
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[str, List[WebSocket]] = {}
+    def __init__(self, max_queue: int = WS_SEND_QUEUE_SIZE, send_timeout: float = WS_SEND_TIMEOUT_SECONDS,
+                 slow_client_policy: str = WS_SLOW_CLIENT_POLICY):
+        self.active_connections: Dict[str, Dict[WebSocket, Subscriber]] = {}
+        self.snapshot_providers: Dict[str, Callable[[], Any]] = {}
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.slow_client_policy = slow_client_policy
+        self.dropped_messages = 0
+        self.slow_disconnects = 0
+        self.send_failures = 0
     
-    async def connect(self, websocket: WebSocket, room: str):
-        await websocket.accept()
-        if room not in self.active_connections:
-            self.active_connections[room] = []
-        self.active_connections[room].append(websocket)
+    async def connect(self, websocket: WebSocket, room: str, subprotocol: Optional[str] = None):
+        await websocket.accept(subprotocol=subprotocol)
+        subscriber = Subscriber(websocket, room, self.max_queue)
+        subscriber.writer = asyncio.create_task(self._writer(subscriber))
+        self.active_connections.setdefault(room, {})[websocket] = subscriber
     
     def disconnect(self, websocket: WebSocket, room: str):
-        if room in self.active_connections:
-            self.active_connections[room].remove(websocket)
+        subscribers = self.active_connections.get(room, {})
+        subscriber = subscribers.pop(websocket, None)
+        if not subscribers:
+            self.active_connections.pop(room, None)
+        if subscriber is None:
+            return
+        if subscriber.writer and subscriber.writer is not asyncio.current_task():
+            subscriber.writer.cancel()
     
-    async def broadcast(self, message: dict, room: str):
-        if room in self.active_connections:
-            for connection in self.active_connections[room]:
-                try:
-                    await connection.send_json(message)
-                except:
-                    pass
+    def register_snapshot(self, room: str, provider: Callable[[], Any]):
+        """Full-state message used to resync clients that fell behind in `room`."""
+        self.snapshot_providers[room] = provider
+    
+    def send(self, websocket: WebSocket, message: Any, room: str):
+        """Queue a message for a single socket (initial snapshots, pongs)."""
+        subscriber = self.active_connections.get(room, {}).get(websocket)
+        if subscriber is not None:
+            self._enqueue(subscriber, message)
+    
+    async def broadcast(self, message: Any, room: str):
+        # Only enqueues; each socket's writer task does the actual send, so a
+        # slow client never delays the caller or the other viewers.
+        with broadcast_fanout_duration.time(room):
+            for subscriber in list(self.active_connections.get(room, {}).values()):
+                self._enqueue(subscriber, message)
+    
+    def _enqueue(self, subscriber: Subscriber, message: Any):
+        try:
+            subscriber.queue.put_nowait(message)
+            return
+        except asyncio.QueueFull:
+            pass
+        
+        if self.slow_client_policy == "drop":
+            self.slow_disconnects += 1
+            self.dropped_messages += subscriber.queue.qsize() + 1
+            logger.warning(f"Dropping slow WebSocket client in room {subscriber.room}")
+            self._close(subscriber, status.WS_1008_POLICY_VIOLATION)
+            return
+        
+        # Resync: the client is too far behind to catch up message by message,
+        # so discard its backlog and restart it from a full snapshot of the room
+        # (or the latest message when the room has no snapshot provider).
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+            subscriber.dropped += 1
+            self.dropped_messages += 1
+        provider = self.snapshot_providers.get(subscriber.room)
+        subscriber.queue.put_nowait(provider() if provider else message)
+    
+    async def _writer(self, subscriber: Subscriber):
+        websocket = subscriber.websocket
+        while True:
+            message = await subscriber.queue.get()
+            try:
+                if isinstance(message, str):
+                    await asyncio.wait_for(websocket.send_text(message), self.send_timeout)
+                elif isinstance(message, bytes):
+                    await asyncio.wait_for(websocket.send_bytes(message), self.send_timeout)
+                else:
+                    await asyncio.wait_for(websocket.send_json(message), self.send_timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.send_failures += 1
+                logger.info(f"Removing WebSocket client in room {subscriber.room} after failed send: {e!r}")
+                self._close(subscriber, status.WS_1011_INTERNAL_ERROR)
+                return
+    
+    def _close(self, subscriber: Subscriber, code: int):
+        self.disconnect(subscriber.websocket, subscriber.room)
+        asyncio.create_task(self._safe_close(subscriber.websocket, code))
+    
+    @staticmethod
+    async def _safe_close(websocket: WebSocket, code: int):
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            pass
+    
+    def stats(self) -> dict:
+        rooms = {}
+        for room, subscribers in self.active_connections.items():
+            depths = [s.queue.qsize() for s in subscribers.values()]
+            rooms[room] = {
+                "connections": len(depths),
+                "queued_messages": sum(depths),
+                "max_queue_depth": max(depths, default=0)
+            }
+        return {
+            "rooms": rooms,
+            "max_queue": self.max_queue,
+            "slow_client_policy": self.slow_client_policy,
+            "dropped_messages": self.dropped_messages,
+            "slow_disconnects": self.slow_disconnects,
+            "send_failures": self.send_failures
+        }
 
 manager = ConnectionManager()
 
+# In-memory standings, loaded from db.colleges on startup
+standings = LeaderboardIndex()
+
+# Event x college points, loaded from db.results on startup
+scores = ScoreMatrix()
+
+# Event and college records for validation and permission checks on the
+# result write path, loaded on startup
+event_cache = EntityCache(db, "events", ("id", "title", "code", "coordinator_ids"), search_fields=("title", "code"))
+college_cache = EntityCache(db, "colleges", ("id", "name", "code"), search_fields=("name", "code"))
+
+# Leaderboard publisher
+LEADERBOARD_PUBLISH_WINDOW_MS = int(os.environ.get('LEADERBOARD_PUBLISH_WINDOW_MS', '150'))
+LEADERBOARD_MAX_STALENESS_MS = int(os.environ.get('LEADERBOARD_MAX_STALENESS_MS', '1000'))
+LEADERBOARD_DELTA_HISTORY = int(os.environ.get('LEADERBOARD_DELTA_HISTORY', '64'))
+
+class LeaderboardPublisher:
+    """Background task that turns bursts of "leaderboard dirty" signals into
+    one broadcast.
+
+    A publish happens once no new signal has arrived for `window` seconds, but
+    never later than `max_staleness` seconds after the first pending signal.
+    Every publish bumps `version` and is sent as a delta against the previous
+    version; recent deltas are kept so a client with a gap can catch up.
+    Frames are encoded once and the same text is queued for every socket.
+    
+    Sockets can also subscribe to a view (rooms "leaderboard:top:<n>",
+    "leaderboard:college:<code>", "leaderboard:event:<event id>"). Each view
+    with subscribers is computed once per publish and only sent when its
+    content changed.
+    
+    Clients that negotiated MessagePack are in PACKED_LEADERBOARD_ROOM and get
+    the same stream in the compact form: colleges are named once and then
+    referenced by small integer ids.
+    """
+    def __init__(self, window: float, max_staleness: float, history: int = LEADERBOARD_DELTA_HISTORY):
+        self.window = window
+        self.max_staleness = max(max_staleness, window)
+        self.signals = 0
+        self.published = 0
+        self.version = 0
+        self._snapshot: List[dict] = []
+        self._snapshot_body: Optional[bytes] = None
+        self._snapshot_frame: Optional[str] = None
+        self._snapshot_packed: Optional[bytes] = None
+        self.college_ids = CollegeIds()
+        self._history: deque = deque(maxlen=history)  # (base_version, frame)
+        self._by_code: Optional[Dict[str, dict]] = None
+        self._views: Dict[str, tuple] = {}  # room -> (data body, frame)
+        self.view_pushes = 0
+        self.views_unchanged = 0
+        self._dirty = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+    
+    def mark_dirty(self):
+        self.signals += 1
+        self._dirty.set()
+    
+    def start(self):
+        if self._task is None:
+            self._snapshot = standings.entries()
+            self._snapshot_body = None
+            self._snapshot_frame = None
+            self._snapshot_packed = None
+            self._by_code = None
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._dirty.wait()
+            deadline = loop.time() + self.max_staleness
+            while True:
+                self._dirty.clear()
+                timeout = min(self.window, deadline - loop.time())
+                if timeout <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(self._dirty.wait(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            self._dirty.clear()
+            try:
+                await self.publish()
+            except Exception:
+                logger.exception("Leaderboard publish failed")
+    
+    async def publish(self):
+        started = time.perf_counter()
+        snapshot = await get_leaderboard_data()
+        changed, removed = diff_leaderboards(self._snapshot, snapshot)
+        if changed or removed:
+            await self._publish_delta(snapshot, changed, removed)
+        # Event views can change without the overall table changing
+        await self._publish_views()
+        leaderboard_recompute_duration.observe(time.perf_counter() - started)
+    
+    async def _publish_delta(self, snapshot: List[dict], changed: List[dict], removed: List[str]):
+        self.version += 1
+        frame = dumps_bytes({
+            "type": "leaderboard_delta",
+            "version": self.version,
+            "base_version": self.version - 1,
+            "changed": changed,
+            "removed": removed
+        }).decode()
+        
+        async def load():
+            return snapshot
+        self._snapshot = snapshot
+        self._snapshot_body = await cached_body("leaderboard", load)
+        self._snapshot_frame = None
+        self._snapshot_packed = None
+        self._by_code = None
+        self._history.append((self.version - 1, frame))
+        self.published += 1
+        await manager.broadcast(frame, "leaderboard")
+        if manager.active_connections.get(PACKED_LEADERBOARD_ROOM):
+            packed = packb({"type": "leaderboard_delta", "version": self.version, "base_version": self.version - 1,
+                            **compact_delta(changed, removed, self.college_ids)})
+            await manager.broadcast(packed, PACKED_LEADERBOARD_ROOM)
+    
+    def snapshot_message(self) -> str:
+        if self._snapshot_frame is None:
+            # Reuse the body GET /api/leaderboard serves instead of encoding the list again
+            body = self._snapshot_body or dumps_bytes(self._snapshot)
+            self._snapshot_frame = f'{{"type":"leaderboard_update","version":{self.version},"data":{body.decode()}}}'
+        return self._snapshot_frame
+    
+    def snapshot_packed(self) -> bytes:
+        if self._snapshot_packed is None:
+            self._snapshot_packed = packb({"type": "leaderboard_update", "version": self.version,
+                                           **compact_snapshot(self._snapshot, self.college_ids)})
+        return self._snapshot_packed
+    
+    def messages_since(self, version: Optional[int]) -> List[str]:
+        """Deltas that bring a client at `version` up to date, or a full
+        snapshot when that version is unknown or no longer in history."""
+        if version == self.version:
+            return []
+        if version is not None and self._history and self._history[0][0] <= version < self.version:
+            return [frame for base_version, frame in self._history if base_version >= version]
+        return [self.snapshot_message()]
+    
+    def college_entry(self, code: str) -> Optional[dict]:
+        if self._by_code is None:
+            self._by_code = {entry["college_code"]: entry for entry in self._snapshot}
+        return self._by_code.get(code)
+    
+    def _view_data(self, room: str):
+        _, kind, key = room.split(":", 2)
+        if kind == "top":
+            return self._snapshot[:int(key)]
+        if kind == "college":
+            return self.college_entry(key)
+        return event_leaderboard_data(key)
+    
+    def _render_view(self, room: str) -> tuple:
+        body = dumps_bytes(self._view_data(room))
+        view = dumps_bytes(room.split(":", 1)[1])
+        frame = f'{{"type":"view_update","view":{view.decode()},"version":{self.version},"data":{body.decode()}}}'
+        return body, frame
+    
+    def view_message(self, room: str) -> str:
+        if room not in self._views:
+            self._views[room] = self._render_view(room)
+        return self._views[room][1]
+    
+    async def _publish_views(self):
+        rooms = [room for room in manager.active_connections if room.startswith("leaderboard:")]
+        for room in list(self._views):
+            if room not in manager.active_connections:
+                del self._views[room]
+        for room in rooms:
+            previous = self._views.get(room)
+            body, frame = self._render_view(room)
+            if previous is not None and previous[0] == body:
+                self.views_unchanged += 1
+                continue
+            self._views[room] = (body, frame)
+            self.view_pushes += 1
+            await manager.broadcast(frame, room)
+    
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "published": self.published,
+            "active_views": len(self._views),
+            "view_pushes": self.view_pushes,
+            "views_unchanged": self.views_unchanged
+        }
+
+PACKED_LEADERBOARD_ROOM = "leaderboard.msgpack"
+
+publisher = LeaderboardPublisher(LEADERBOARD_PUBLISH_WINDOW_MS / 1000, LEADERBOARD_MAX_STALENESS_MS / 1000)
+manager.register_snapshot("leaderboard", publisher.snapshot_message)
+manager.register_snapshot(PACKED_LEADERBOARD_ROOM, publisher.snapshot_packed)
+
+# Versions and encoded bodies of the public read endpoints (ETag / 304 support)
+response_cache = VersionedResponseCache()
+
+def leaderboard_changed():
+    """Call after any write that changes college totals or the set of colleges."""
+    response_cache.bump("leaderboard", "colleges")
+    publisher.mark_dirty()
+
+# Cross-worker change feed. Every worker applies changes made by the others to
+# its in-memory state and publishes to its own WebSocket subscribers.
+BROADCAST_BACKEND = os.environ.get('BROADCAST_BACKEND', 'inprocess')  # inprocess, changestream, broker
+BROADCAST_BROKER_URL = os.environ.get('BROADCAST_BROKER_URL', 'local')  # local or redis://...
+CHANGE_STREAM_PRE_IMAGES = os.environ.get('CHANGE_STREAM_PRE_IMAGES', 'false').lower() == 'true'
+shared_feed = create_backend(BROADCAST_BACKEND, db=db, broker_url=BROADCAST_BROKER_URL,
+                             pre_images=CHANGE_STREAM_PRE_IMAGES)
+applied_result_changes = RecentKeys()
+
+# Points ledger reconciliation (colleges.total_points vs. sum of results)
+RECONCILE_INTERVAL_SECONDS = float(os.environ.get('RECONCILE_INTERVAL_SECONDS', '0'))  # 0 disables
+RECONCILE_SETTLE_SECONDS = float(os.environ.get('RECONCILE_SETTLE_SECONDS', '5'))
+reconciler = PointsReconciler(db, settle_seconds=RECONCILE_SETTLE_SECONDS)
+
+# Periodic leaderboard snapshots for point-in-time queries and warm starts
+LEADERBOARD_SNAPSHOT_INTERVAL_SECONDS = float(os.environ.get('LEADERBOARD_SNAPSHOT_INTERVAL_SECONDS', '300'))  # 0 disables
+LEADERBOARD_SNAPSHOT_SETTLE_SECONDS = float(os.environ.get('LEADERBOARD_SNAPSHOT_SETTLE_SECONDS', '5'))
+history = LeaderboardHistory(db, interval=LEADERBOARD_SNAPSHOT_INTERVAL_SECONDS,
+                             settle_seconds=LEADERBOARD_SNAPSHOT_SETTLE_SECONDS)
+
+def result_change(op: str, results: List[dict]) -> dict:
+    return {
+        "kind": "results",
+        "op": op,
+        "results": [
+            {"id": r["id"], "event_id": r["event_id"], "college_id": r["college_id"], "points": r["points"],
+             "timestamp": r.get("timestamp")}
+            for r in results
+        ]
+    }
+
+def apply_result_changes(op: str, results: List[dict], apply_totals: bool = True, reconciled: bool = False):
+    """Apply added/removed results to the in-memory standings and score matrix.
+    Each result is applied at most once per worker, whichever path sees it first.
+    Removals the reconciler has not been told about (reconciled=False) make its
+    next pass full."""
+    changed = False
+    for r in results:
+        if not applied_result_changes.add(f"{op}:{r['id']}"):
+            continue
+        delta = r["points"] if op == "add" else -r["points"]
+        if op == "remove" and not reconciled:
+            reconciler.invalidate()
+        if apply_totals:
+            standings.apply_delta(r["college_id"], delta)
+        scores.add(r["event_id"], r["college_id"], delta)
+        changed = True
+    if changed:
+        leaderboard_changed()
+
+def apply_college_change(op: str, college: dict):
+    if op == "upsert":
+        standings.add_college(college)
+        scores.add_college(college["id"], college)
+        college_cache.upsert(college)
+    else:
+        standings.remove_college(college["id"])
+        scores.remove_college(college["id"])
+        college_cache.remove(college["id"])
+    # The set of colleges and their names, as opposed to their totals
+    response_cache.bump("college_directory")
+    leaderboard_changed()
+
+def apply_college_totals(totals: Dict[str, int]):
+    """Set absolute college totals, leaving the college directory and caches alone."""
+    changed = False
+    for college_id, points in totals.items():
+        entry = standings.get(college_id)
+        if entry is not None and entry["total_points"] != points:
+            standings.set_points(college_id, points)
+            changed = True
+    if changed:
+        leaderboard_changed()
+
+def apply_event_change(op: str, event: dict):
+    if op == "upsert":
+        scores.add_event(event["id"], event)
+        event_cache.upsert(event)
+    else:
+        scores.remove_event(event["id"])
+        event_cache.remove(event["id"])
+    response_cache.bump("events")
+    publisher.mark_dirty()
+
+async def share_change(message: dict):
+    try:
+        await shared_feed.publish(message)
+    except Exception:
+        logger.exception(f"Failed to share {message['kind']} change with other workers")
+
+async def apply_shared_change(message: dict):
+    kind = message.get("kind")
+    if kind == "results":
+        apply_result_changes(message["op"], message["results"], message.get("apply_totals", True))
+    elif kind == "college":
+        apply_college_change(message["op"], message.get("college") or {"id": message["id"]})
+    elif kind == "college_totals":
+        apply_college_totals(message["totals"])
+    elif kind == "event":
+        apply_event_change(message["op"], message.get("event") or {"id": message["id"]})
+    elif kind == "user":
+        invalidate_principal(message["id"])
+    elif kind == "resync":
+        reconciler.invalidate()
+        await load_entities()
+        await load_standings()
+        response_cache.bump("leaderboard", "colleges", "college_directory", "events")
+        publisher.mark_dirty()
+
+async def apply_reconcile_report(report: dict):
+    """Reload repaired totals into memory and share them with other workers."""
+    college_ids = [d["college_id"] for d in report["drifted"]]
+    if not college_ids or report["dry_run"] or report["inconclusive"]:
+        return
+    async for college in db.colleges.find({"id": {"$in": college_ids}}, {"_id": 0}):
+        apply_college_change("upsert", college)
+        await share_change({"kind": "college", "op": "upsert", "college": College(**college).model_dump()})
+
+async def cached_body(dataset: str, load: Callable, variant: str = "", encode: Callable = dumps_bytes,
+                      store: bool = True) -> bytes:
+    """Encoded body of `dataset` for its current version, encoding it at most
+    once. With store=False the body is encoded per call and not kept."""
+    if not store:
+        return encode(await load())
+    body = response_cache.get(dataset, variant)
+    if body is None:
+        version = response_cache.version(dataset)
+        body = encode(await load())
+        response_cache.put(dataset, version, body, variant)
+    return body
+
+async def cached_json_response(request: Request, dataset: str, load: Callable, variant: str = "",
+                               encode: Callable = dumps_bytes, media_type: str = "application/json",
+                               vary: Optional[str] = None, store: bool = True) -> Response:
+    """Serve `dataset` with an ETag, answering If-None-Match with 304 and
+    reusing the last encoded body while the dataset version is unchanged."""
+    etag = response_cache.etag(dataset, variant)
+    headers = {"ETag": etag, "Cache-Control": "public, no-cache"}
+    if vary:
+        headers["Vary"] = vary
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+        response_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+    
+    body = await cached_body(dataset, load, variant, encode, store)
+    return Response(content=body, media_type=media_type, headers=headers)
+
 # Models
 class UserCreate(BaseModel):
     username: str
@@ -122,18 +679,78 @@ class Result(BaseModel):
     recorded_by: str
     timestamp: str
 
+class DashboardResult(Result):
+    college_name: Optional[str] = None
+    college_code: Optional[str] = None
+
+class DashboardResponse(BaseModel):
+    version: str
+    full: bool
+    events: List[Event]
+    colleges: Optional[List[College]] = None  # omitted when unchanged since `since`
+    users: Optional[List[User]] = None  # admins only
+    results: List[DashboardResult]
+    removed_result_ids: List[str]
+    has_more: bool
+
+class EventStandingEntry(BaseModel):
+    rank: int
+    college_id: str
+    college_name: str
+    college_code: str
+    points: int
+
+class EventPoints(BaseModel):
+    event_id: str
+    event_title: Optional[str] = None
+    event_code: Optional[str] = None
+    points: int
+
+class CollegeBreakdown(BaseModel):
+    college_id: str
+    college_name: str
+    college_code: str
+    total_points: int
+    events: List[EventPoints]
+
+class BatchResultItem(BaseModel):
+    index: int
+    success: bool
+    result: Optional[Result] = None
+    error: Optional[str] = None
+
+class BatchResultResponse(BaseModel):
+    created: int
+    failed: int
+    items: List[BatchResultItem]
+
 class LeaderboardEntry(BaseModel):
     rank: int
     college_name: str
     college_code: str
     total_points: int
 
+class HistoryPoint(BaseModel):
+    as_of: str
+    total_points: int
+    rank: int
+
+class CollegeHistory(BaseModel):
+    college_id: str
+    points: List[HistoryPoint]
+
 # Utility Functions
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+async def hash_password_async(password: str) -> str:
+    try:
+        return await password_hasher.hash(password)
+    except PasswordHasherBusy:
+        raise HTTPException(status_code=503, detail="Server busy, please retry", headers={"Retry-After": "1"})
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    try:
+        return await password_hasher.verify(plain_password, hashed_password)
+    except PasswordHasherBusy:
+        raise HTTPException(status_code=503, detail="Server busy, please retry", headers={"Retry-After": "1"})
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -141,7 +758,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.now(timezone.utc) + expires_delta
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.now(timezone.utc)})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -154,22 +771,98 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             raise HTTPException(status_code=401, detail="Invalid authentication credentials")
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
-    except jwt.JWTError:
+    except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
     
-    user = await db.users.find_one({"id": user_id}, {"_id": 0})
+    principal = principal_from_claims(payload)
+    if principal is not None:
+        return principal
+    
+    user = principal_cache.get(user_id)
     if user is None:
-        raise HTTPException(status_code=401, detail="User not found")
+        user = await db.users.find_one({"id": user_id}, {"_id": 0, "password_hash": 0})
+        if user is None:
+            raise HTTPException(status_code=401, detail="User not found")
+        principal_cache.set(user_id, user)
     return user
 
+def principal_claims(user: dict) -> dict:
+    return {
+        "sub": user["id"],
+        "role": user["role"],
+        "username": user["username"],
+        "email": user["email"],
+        "event_ids": user.get("event_ids", [])
+    }
+
+def principal_from_claims(payload: dict) -> Optional[dict]:
+    """Principal carried by a recently issued token, when TRUST_TOKEN_CLAIMS is on."""
+    if not TRUST_TOKEN_CLAIMS:
+        return None
+    issued_at = payload.get("iat")
+    if issued_at is None or datetime.now(timezone.utc).timestamp() - issued_at > TOKEN_CLAIMS_MAX_AGE_SECONDS:
+        return None
+    if any(claim not in payload for claim in ("role", "username", "email", "event_ids")):
+        return None
+    return {
+        "id": payload["sub"],
+        "username": payload["username"],
+        "email": payload["email"],
+        "role": payload["role"],
+        "event_ids": payload["event_ids"]
+    }
+
+def invalidate_principal(user_id: str):
+    principal_cache.invalidate(user_id)
+
 async def get_admin_user(current_user: dict = Depends(get_current_user)):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     return current_user
 
+def admission_error(exc: AdmissionRejected) -> HTTPException:
+    detail = "Server busy, please retry" if exc.reason == "overloaded" else "Too many requests, please retry later"
+    return HTTPException(status_code=429, detail=detail, headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))})
+
+def rate_limited(route_class: str, principal: Callable = get_current_user):
+    """Dependency returning the user from `principal` once it has been charged
+    a token of `route_class`"""
+    async def dependency(current_user: dict = Depends(principal)):
+        try:
+            await rate_limiter.check(route_class, current_user["id"])
+        except AdmissionRejected as exc:
+            raise admission_error(exc)
+        return current_user
+    return dependency
+
+async def rate_limit_login(request: Request, email: str):
+    """Login budget per client IP and account: a venue's attendees share one
+    NAT address, and each still gets their own bucket."""
+    # Behind a proxy, run uvicorn with --proxy-headers so this is the real client
+    host = request.client.host if request.client else "unknown"
+    try:
+        await rate_limiter.check("login", f"{host}:{email.lower()}")
+    except AdmissionRejected as exc:
+        raise admission_error(exc)
+
+def acquire_expensive_slot() -> GateSlot:
+    try:
+        return expensive_gate.acquire()
+    except AdmissionRejected as exc:
+        raise admission_error(exc)
+
+async def expensive_route():
+    """Dependency holding a slot of the expensive route gate for the request.
+    Streaming responses take and release theirs around the stream instead."""
+    slot = acquire_expensive_slot()
+    try:
+        yield
+    finally:
+        slot.release()
+
 # Routes
 @api_router.post("/auth/register", response_model=User)
-async def register(user_data: UserCreate, current_user: dict = Depends(get_admin_user)):
+async def register(user_data: UserCreate, current_user: dict = Depends(rate_limited("admin", get_admin_user))):
     """Admin only: Register new users"""
     existing_user = await db.users.find_one({"email": user_data.email})
     if existing_user:
@@ -180,21 +873,24 @@ async def register(user_data: UserCreate, current_user: dict = Depends(get_admin
         "id": user_id,
         "username": user_data.username,
         "email": user_data.email,
-        "password_hash": hash_password(user_data.password),
+        "password_hash": await hash_password_async(user_data.password),
         "role": user_data.role,
         "event_ids": user_data.event_ids,
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     await db.users.insert_one(user_doc)
+    invalidate_principal(user_id)
+    await share_change({"kind": "user", "id": user_id})
     return User(id=user_id, username=user_data.username, email=user_data.email, role=user_data.role, event_ids=user_data.event_ids)
 
 @api_router.post("/auth/login", response_model=TokenResponse)
-async def login(credentials: UserLogin):
+async def login(request: Request, credentials: UserLogin):
+    await rate_limit_login(request, credentials.email)
     user = await db.users.find_one({"email": credentials.email}, {"_id": 0})
-    if not user or not verify_password(credentials.password, user["password_hash"]):
+    if not user or not await verify_password_async(credentials.password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
-    access_token = create_access_token(data={"sub": user["id"], "role": user["role"]})
+    access_token = create_access_token(data=principal_claims(user))
     user_obj = User(id=user["id"], username=user["username"], email=user["email"], role=user["role"], event_ids=user.get("event_ids", []))
     return TokenResponse(access_token=access_token, user=user_obj)
 
@@ -204,7 +900,7 @@ async def get_me(current_user: dict = Depends(get_current_user)):
 
 # College Routes
 @api_router.post("/colleges", response_model=College)
-async def create_college(college: CollegeCreate, current_user: dict = Depends(get_admin_user)):
+async def create_college(college: CollegeCreate, current_user: dict = Depends(rate_limited("admin", get_admin_user))):
     college_id = str(uuid.uuid4())
     college_doc = {
         "id": college_id,
@@ -213,23 +909,38 @@ async def create_college(college: CollegeCreate, current_user: dict = Depends(ge
         "total_points": 0
     }
     await db.colleges.insert_one(college_doc)
+    apply_college_change("upsert", dict(college_doc))
+    await share_change({"kind": "college", "op": "upsert", "college": College(**college_doc).model_dump()})
     return College(**college_doc)
 
 @api_router.get("/colleges", response_model=List[College])
-async def get_colleges():
-    colleges = await db.colleges.find({}, {"_id": 0}).to_list(1000)
+async def get_colleges(request: Request):
+    async def load():
+        colleges = await db.colleges.find({}, {"_id": 0}).to_list(1000)
+        return [College(**c).model_dump() for c in colleges]
+    return await cached_json_response(request, "colleges", load)
+
+@api_router.get("/colleges/search", response_model=List[College])
+async def search_colleges(q: str = Query(..., min_length=1, max_length=100), limit: int = Query(10, ge=1, le=50)):
+    """Colleges matching `q` by name or code, best match first"""
+    colleges = []
+    for college in college_cache.search(q, limit):
+        entry = standings.get(college["id"])
+        colleges.append({**college, "total_points": entry["total_points"] if entry else 0})
     return colleges
 
 @api_router.delete("/colleges/{college_id}")
-async def delete_college(college_id: str, current_user: dict = Depends(get_admin_user)):
+async def delete_college(college_id: str, current_user: dict = Depends(rate_limited("admin", get_admin_user))):
     result = await db.colleges.delete_one({"id": college_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="College not found")
+    apply_college_change("remove", {"id": college_id})
+    await share_change({"kind": "college", "op": "remove", "id": college_id})
     return {"message": "College deleted successfully"}
 
 # Event Routes
 @api_router.post("/events", response_model=Event)
-async def create_event(event: EventCreate, current_user: dict = Depends(get_admin_user)):
+async def create_event(event: EventCreate, current_user: dict = Depends(rate_limited("admin", get_admin_user))):
     event_id = str(uuid.uuid4())
     event_doc = {
         "id": event_id,
@@ -238,6 +949,8 @@ async def create_event(event: EventCreate, current_user: dict = Depends(get_admi
         "coordinator_ids": event.coordinator_ids
     }
     await db.events.insert_one(event_doc)
+    apply_event_change("upsert", dict(event_doc))
+    await share_change({"kind": "event", "op": "upsert", "event": Event(**event_doc).model_dump()})
     return Event(**event_doc)
 
 @api_router.get("/events", response_model=List[Event])
@@ -249,23 +962,32 @@ async def get_events(current_user: dict = Depends(get_current_user)):
     return events
 
 @api_router.get("/events/all", response_model=List[Event])
-async def get_all_events():
+async def get_all_events(request: Request):
     """Public endpoint to get all events"""
-    events = await db.events.find({}, {"_id": 0}).to_list(1000)
-    return events
+    async def load():
+        events = await db.events.find({}, {"_id": 0}).to_list(1000)
+        return [Event(**e).model_dump() for e in events]
+    return await cached_json_response(request, "events", load)
+
+@api_router.get("/events/search", response_model=List[Event])
+async def search_events(q: str = Query(..., min_length=1, max_length=100), limit: int = Query(10, ge=1, le=50)):
+    """Events matching `q` by title or code, best match first"""
+    return event_cache.search(q, limit)
 
 @api_router.delete("/events/{event_id}")
-async def delete_event(event_id: str, current_user: dict = Depends(get_admin_user)):
+async def delete_event(event_id: str, current_user: dict = Depends(rate_limited("admin", get_admin_user))):
     result = await db.events.delete_one({"id": event_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Event not found")
+    apply_event_change("remove", {"id": event_id})
+    await share_change({"kind": "event", "op": "remove", "id": event_id})
     return {"message": "Event deleted successfully"}
 
 # Result Routes - Updated for manual points and achievement statements
 @api_router.post("/results", response_model=Result)
-async def create_result(result_data: ResultCreate, current_user: dict = Depends(get_current_user)):
+async def create_result(result_data: ResultCreate, current_user: dict = Depends(rate_limited("results"))):
     # Check if user has permission for this event
-    event = await db.events.find_one({"id": result_data.event_id}, {"_id": 0})
+    event = await event_cache.get(result_data.event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -273,7 +995,7 @@ async def create_result(result_data: ResultCreate, current_user: dict = Depends(
         raise HTTPException(status_code=403, detail="You don't have permission for this event")
     
     # Check if college exists
-    college = await db.colleges.find_one({"id": result_data.college_id}, {"_id": 0})
+    college = await college_cache.get(result_data.college_id)
     if not college:
         raise HTTPException(status_code=404, detail="College not found")
     
@@ -295,84 +1017,524 @@ async def create_result(result_data: ResultCreate, current_user: dict = Depends(
         {"id": result_data.college_id},
         {"$inc": {"total_points": result_data.points}}
     )
-    
-    # Broadcast update
-    await manager.broadcast({
-        "type": "leaderboard_update",
-        "data": await get_leaderboard_data()
-    }, "leaderboard")
+    apply_result_changes("add", [result_doc])
+    await share_change(result_change("add", [result_doc]))
     
     return Result(**result_doc)
 
+_transactions_supported: Optional[bool] = None
+
+async def supports_transactions() -> bool:
+    """Multi-document transactions need a replica set or a sharded cluster."""
+    global _transactions_supported
+    if _transactions_supported is None:
+        try:
+            hello = await client.admin.command("hello")
+            _transactions_supported = "setName" in hello or hello.get("msg") == "isdbgrid"
+        except Exception:
+            _transactions_supported = False
+    return _transactions_supported
+
+@api_router.post("/results/batch", response_model=BatchResultResponse, dependencies=[Depends(expensive_route)])
+async def create_results_batch(results_data: List[ResultCreate],
+                               partial: bool = Query(False, description="Record the valid items even if others fail"),
+                               current_user: dict = Depends(rate_limited("results"))):
+    """Record several results at once, e.g. all placements of one event.
+
+    The batch is all-or-nothing: if any item fails validation, each item's
+    outcome is reported and nothing is written. With partial=true the valid
+    items are recorded regardless. They are written together (inside a
+    transaction when the deployment supports it) and trigger a single
+    leaderboard publish.
+    """
+    if not results_data:
+        raise HTTPException(status_code=400, detail="No results provided")
+    if len(results_data) > RESULT_BATCH_MAX_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {RESULT_BATCH_MAX_SIZE} results per batch")
+    
+    # Everything the batch references, from memory (at most one query each for misses)
+    events = await event_cache.get_many(item.event_id for item in results_data)
+    existing_colleges = set(await college_cache.get_many(item.college_id for item in results_data))
+    
+    items: List[BatchResultItem] = []
+    result_docs = []
+    increments: Dict[str, int] = {}
+    for index, item in enumerate(results_data):
+        event = events.get(item.event_id)
+        if not event:
+            error = "Event not found"
+        elif current_user["role"] != "admin" and current_user["id"] not in event["coordinator_ids"]:
+            error = "You don't have permission for this event"
+        elif item.college_id not in existing_colleges:
+            error = "College not found"
+        else:
+            error = None
+        if error:
+            items.append(BatchResultItem(index=index, success=False, error=error))
+            continue
+        
+        result_doc = {
+            "id": str(uuid.uuid4()),
+            "event_id": item.event_id,
+            "college_id": item.college_id,
+            "points": item.points,
+            "achievement_statement": item.achievement_statement,
+            "recorded_by": current_user["id"],
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+        result_docs.append(result_doc)
+        increments[item.college_id] = increments.get(item.college_id, 0) + item.points
+        items.append(BatchResultItem(index=index, success=True, result=Result(**result_doc)))
+    
+    if not partial and len(result_docs) < len(items):
+        items = [
+            item if not item.success
+            else BatchResultItem(index=item.index, success=False, error="Not recorded: other items in the batch failed")
+            for item in items
+        ]
+        return BatchResultResponse(created=0, failed=len(items), items=items)
+    
+    if result_docs:
+        point_updates = [
+            UpdateOne({"id": college_id}, {"$inc": {"total_points": points}})
+            for college_id, points in increments.items()
+        ]
+        if await supports_transactions():
+            async with await client.start_session() as session:
+                async with session.start_transaction():
+                    await db.results.insert_many(result_docs, ordered=True, session=session)
+                    await db.colleges.bulk_write(point_updates, ordered=False, session=session)
+        else:
+            await db.results.insert_many(result_docs, ordered=True)
+            await db.colleges.bulk_write(point_updates, ordered=False)
+        
+        apply_result_changes("add", result_docs)
+        await share_change(result_change("add", result_docs))
+    
+    created = len(result_docs)
+    return BatchResultResponse(created=created, failed=len(items) - created, items=items)
+
+def encode_results_cursor(result: dict) -> str:
+    raw = json.dumps([result["timestamp"], result["id"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_results_cursor(token: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        timestamp, result_id = json.loads(raw)
+        if not isinstance(timestamp, str) or not isinstance(result_id, str):
+            raise ValueError(token)
+        return timestamp, result_id
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def compact_results(results: List[dict]) -> dict:
+    """Results as rows, with event and college ids replaced by indexes into
+    per-page lists (used for MessagePack responses)."""
+    events: Dict[str, int] = {}
+    colleges: Dict[str, int] = {}
+    rows = [
+        [r["id"], events.setdefault(r["event_id"], len(events)), colleges.setdefault(r["college_id"], len(colleges)),
+         r["points"], r["achievement_statement"], r["recorded_by"], r["timestamp"]]
+        for r in results
+    ]
+    return {
+        "columns": ["id", "event", "college", "points", "achievement_statement", "recorded_by", "timestamp"],
+        "events": list(events),
+        "colleges": list(colleges),
+        "rows": rows
+    }
+
 @api_router.get("/results", response_model=List[Result])
-async def get_results(event_id: Optional[str] = None):
-    query = {"event_id": event_id} if event_id else {}
-    results = await db.results.find(query, {"_id": 0}).sort("timestamp", -1).to_list(1000)
+async def get_results(
+    request: Request,
+    response: Response,
+    event_id: Optional[str] = None,
+    college_id: Optional[str] = None,
+    since: Optional[datetime] = Query(None, description="Only results recorded at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only results recorded before this time"),
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=RESULTS_PAGE_MAX_SIZE),
+    format: str = Query("json", pattern="^(json|ndjson)$")
+):
+    """Results newest first, paginated by (timestamp, id).
+
+    When more results exist, the cursor for the next page is returned in the
+    X-Next-Cursor header. format=ndjson streams every matching result (or
+    `limit` of them) without buffering the whole list, holding a slot of the
+    expensive route gate like the exports. Pages are sent as MessagePack (see
+    compact_results) when the Accept header asks for it.
+    """
+    query: Dict[str, Any] = {}
+    if event_id:
+        query["event_id"] = event_id
+    if college_id:
+        query["college_id"] = college_id
+    if since is not None or until is not None:
+        query["timestamp"] = {}
+        if since is not None:
+            query["timestamp"]["$gte"] = to_timestamp(since)
+        if until is not None:
+            query["timestamp"]["$lt"] = to_timestamp(until)
+    if after:
+        timestamp, result_id = decode_results_cursor(after)
+        query["$or"] = [
+            {"timestamp": {"$lt": timestamp}},
+            {"timestamp": timestamp, "id": {"$lt": result_id}}
+        ]
+    cursor = db.results.find(query, {"_id": 0}).sort([("timestamp", -1), ("id", -1)])
+    
+    if format == "ndjson":
+        if limit:
+            cursor = cursor.limit(limit)
+        cursor = cursor.batch_size(RESULTS_STREAM_BATCH_SIZE)
+        # Unbounded, this reads the whole collection: gated like the exports
+        slot = acquire_expensive_slot()
+        
+        async def stream_results():
+            try:
+                async for result in cursor:
+                    yield json.dumps(result) + "\n"
+            finally:
+                slot.release()
+        
+        return StreamingResponse(stream_results(), media_type="application/x-ndjson",
+                                 background=BackgroundTask(slot.release))
+    
+    page_size = limit or RESULTS_PAGE_MAX_SIZE
+    results = await cursor.limit(page_size + 1).to_list(page_size + 1)
+    headers = {"Vary": "Accept"}
+    if len(results) > page_size:
+        results = results[:page_size]
+        headers["X-Next-Cursor"] = encode_results_cursor(results[-1])
+    if accepts_msgpack(request.headers.get("accept")):
+        return Response(content=packb(compact_results(results)), media_type=MSGPACK_MEDIA_TYPE, headers=headers)
+    response.headers.update(headers)
     return results
 
 @api_router.delete("/results/{result_id}")
-async def delete_result(result_id: str, current_user: dict = Depends(get_current_user)):
+async def delete_result(result_id: str, current_user: dict = Depends(rate_limited("results"))):
     result = await db.results.find_one({"id": result_id}, {"_id": 0})
     if not result:
         raise HTTPException(status_code=404, detail="Result not found")
     
     # Check permissions
     if current_user["role"] != "admin":
-        event = await db.events.find_one({"id": result["event_id"]}, {"_id": 0})
-        if current_user["id"] not in event["coordinator_ids"]:
+        event = await event_cache.get(result["event_id"])
+        if not event or current_user["id"] not in event["coordinator_ids"]:
             raise HTTPException(status_code=403, detail="No permission to delete this result")
     
-    # Delete result
-    await db.results.delete_one({"id": result_id})
+    # Tombstone first so past leaderboards keep counting the result even if
+    # this request dies right after the delete
+    tombstones = await history.record_deleted([result])
+    async with reconciler.deleting():
+        deleted = await db.results.delete_one({"id": result_id})
+        if deleted.deleted_count:
+            reconciler.note_deleted(result)
+    if not deleted.deleted_count:
+        # A concurrent request deleted it and already did the bookkeeping
+        await history.forget_deleted(tombstones)
+        raise HTTPException(status_code=404, detail="Result not found")
     
     # Update college points
     await db.colleges.update_one(
         {"id": result["college_id"]},
         {"$inc": {"total_points": -result["points"]}}
     )
-    
-    # Broadcast update
-    await manager.broadcast({
-        "type": "leaderboard_update",
-        "data": await get_leaderboard_data()
-    }, "leaderboard")
+    apply_result_changes("remove", [result], reconciled=True)
+    await share_change(result_change("remove", [result]))
     
     return {"message": "Result deleted successfully"}
 
+# Dashboard
+def encode_dashboard_version(timestamp: str, colleges_etag: str) -> str:
+    raw = json.dumps([timestamp, colleges_etag]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_dashboard_version(token: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        timestamp, colleges_etag = json.loads(raw)
+        if not isinstance(timestamp, str) or not isinstance(colleges_etag, str):
+            raise ValueError(token)
+        return timestamp, colleges_etag
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid dashboard version")
+
+@api_router.get("/dashboard", response_model=DashboardResponse, dependencies=[Depends(expensive_route)])
+async def get_dashboard(
+    since: Optional[str] = Query(None, description="`version` of the previous response, for an incremental refresh"),
+    include_results: bool = True,
+    current_user: dict = Depends(get_current_user)
+):
+    """Everything a dashboard shows in one call: the caller's events (all of
+    them for admins), their results joined with college name and code, the
+    college list and, for admins, the users.
+
+    With `since`, only results recorded after that version and the ids of
+    results deleted since are returned; colleges are omitted if unchanged.
+    Clients merge results by id.
+    """
+    since_ts, since_colleges = decode_dashboard_version(since) if since else (None, None)
+    is_admin = current_user["role"] == "admin"
+    version_ts = (datetime.now(timezone.utc) - timedelta(seconds=DASHBOARD_SETTLE_SECONDS)).isoformat()
+    colleges_etag = response_cache.etag("college_directory")
+    
+    if is_admin:
+        events = await db.events.find({}, {"_id": 0}).to_list(1000)
+    else:
+        events = await db.events.find(
+            {"$or": [{"coordinator_ids": current_user["id"]}, {"id": {"$in": current_user.get("event_ids", [])}}]},
+            {"_id": 0}
+        ).to_list(1000)
+    scope: Dict[str, Any] = {} if is_admin else {"event_id": {"$in": [e["id"] for e in events]}}
+    
+    results, removed, has_more = [], [], False
+    if include_results:
+        match = dict(scope)
+        if since_ts:
+            match["timestamp"] = {"$gt": since_ts}
+        results = await db.results.aggregate([
+            {"$match": match},
+            {"$sort": {"timestamp": -1, "id": -1}},
+            {"$limit": DASHBOARD_RESULTS_LIMIT + 1},
+            {"$lookup": {"from": "colleges", "localField": "college_id", "foreignField": "id", "as": "college"}},
+            {"$unwind": {"path": "$college", "preserveNullAndEmptyArrays": True}},
+            {"$project": {
+                "_id": 0, "id": 1, "event_id": 1, "college_id": 1, "points": 1, "achievement_statement": 1,
+                "recorded_by": 1, "timestamp": 1, "college_name": "$college.name", "college_code": "$college.code"
+            }}
+        ]).to_list(DASHBOARD_RESULTS_LIMIT + 1)
+        has_more = len(results) > DASHBOARD_RESULTS_LIMIT
+        results = results[:DASHBOARD_RESULTS_LIMIT]
+        if since_ts:
+            removed = [t["id"] async for t in db.result_tombstones.find(
+                {**scope, "deleted_at": {"$gt": since_ts}}, {"_id": 0, "id": 1})]
+    
+    colleges = None
+    if since_colleges != colleges_etag:
+        colleges = await db.colleges.find({}, {"_id": 0}).to_list(1000)
+    users = None
+    if is_admin:
+        users = await db.users.find({}, {"_id": 0, "password_hash": 0}).to_list(1000)
+    
+    return DashboardResponse(
+        version=encode_dashboard_version(version_ts, colleges_etag),
+        full=since is None,
+        events=events,
+        colleges=colleges,
+        users=users,
+        results=results,
+        removed_result_ids=removed,
+        has_more=has_more
+    )
+
 # Leaderboard
-async def get_leaderboard_data():
-    colleges = await db.colleges.find({}, {"_id": 0}).sort("total_points", -1).to_list(1000)
+async def load_entities():
+    await event_cache.load()
+    await college_cache.load()
+    logger.info(f"Cached {len(event_cache)} events and {len(college_cache)} colleges")
+
+async def load_standings():
+    colleges = await db.colleges.find(
+        {}, {"_id": 0, "id": 1, "name": 1, "code": 1, "total_points": 1}
+    ).to_list(None)
+    standings.load(colleges)
+    logger.info(f"Loaded standings for {len(standings)} colleges")
+    
+    events = await db.events.find({}, {"_id": 0, "id": 1, "title": 1, "code": 1}).to_list(None)
+    # Starts from the latest snapshot, so only results since then are scanned
+    cells = await history.cells_at()
+    scores.load(events, colleges, ((event_id, college_id, points) for (event_id, college_id), points in cells.items()))
+    logger.info(f"Loaded score matrix for {len(scores.events)} events x {len(scores.colleges)} colleges")
+
+LEADERBOARD_CACHED_LIMITS = (3, 5, 10, 20, 50, 100)
+
+async def get_leaderboard_data(limit: Optional[int] = None):
+    return standings.top(limit)
+
+def to_timestamp(value: datetime) -> str:
+    """Same ISO-8601 UTC form as stored timestamps; naive values are taken as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+@api_router.get("/leaderboard", response_model=List[LeaderboardEntry])
+async def get_leaderboard(request: Request, limit: Optional[int] = Query(None, ge=1),
+                          as_of: Optional[datetime] = None):
+    # Accept: application/msgpack gets the compact form (see compact_snapshot)
+    packed = accepts_msgpack(request.headers.get("accept"))
+    if as_of is not None:
+        # Standings at a past instant, replayed from the nearest snapshot
+        as_of_ts = to_timestamp(as_of)
+        slot = acquire_expensive_slot()
+        try:
+            data = await history.standings_at(as_of_ts, limit)
+        finally:
+            slot.release()
+        # A settled past never changes: later deletes keep counting before their deleted_at
+        settled = (datetime.now(timezone.utc) - timedelta(seconds=LEADERBOARD_SNAPSHOT_SETTLE_SECONDS)).isoformat()
+        headers = {"Cache-Control": "public, max-age=3600" if as_of_ts < settled else "no-store", "Vary": "Accept"}
+        if packed:
+            return Response(content=packb(compact_snapshot(data, publisher.college_ids)),
+                            media_type=MSGPACK_MEDIA_TYPE, headers=headers)
+        return Response(content=dumps_bytes(data), media_type="application/json", headers=headers)
+    
+    if limit is not None and limit >= len(standings):
+        limit = None
+    # Only the full table and a few common top-N sizes keep an encoded body;
+    # any other limit is sliced from the standings and encoded per request
+    store = limit is None or limit in LEADERBOARD_CACHED_LIMITS
+    variant = f"top{limit}" if limit else ""
+    if packed:
+        async def load_packed():
+            return compact_snapshot(await get_leaderboard_data(limit), publisher.college_ids)
+        return await cached_json_response(request, "leaderboard", load_packed, variant=f"msgpack{variant}",
+                                          encode=packb, media_type=MSGPACK_MEDIA_TYPE, vary="Accept", store=store)
+    
+    async def load():
+        return await get_leaderboard_data(limit)
+    return await cached_json_response(request, "leaderboard", load, variant=variant, vary="Accept", store=store)
+
+@api_router.get("/leaderboard/history", response_model=CollegeHistory, dependencies=[Depends(expensive_route)])
+async def get_college_history(college_id: str, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                              limit: int = Query(500, ge=1, le=5000)):
+    """Total points and rank of a college at each snapshot, oldest first,
+    followed by its current standing"""
+    points = await history.college_history(
+        college_id,
+        since=to_timestamp(since) if since else None,
+        until=to_timestamp(until) if until else None,
+        limit=limit
+    )
+    entry = standings.entry_for(college_id)
+    if entry is not None and until is None:
+        points.append({"as_of": datetime.now(timezone.utc).isoformat(),
+                       "total_points": entry["total_points"], "rank": entry["rank"]})
+    if entry is None and not points:
+        raise HTTPException(status_code=404, detail="College not found")
+    return CollegeHistory(college_id=college_id, points=[HistoryPoint(**p) for p in points])
+
+def event_leaderboard_data(event_id: str) -> Optional[List[dict]]:
+    event_scores = scores.event_standings(event_id)
+    if event_scores is None:
+        return None
     leaderboard = []
-    for idx, college in enumerate(colleges, 1):
+    for idx, (college_id, points) in enumerate(event_scores, 1):
+        college = scores.college_info[college_id]
         leaderboard.append({
             "rank": idx,
+            "college_id": college_id,
             "college_name": college["name"],
             "college_code": college["code"],
-            "total_points": college["total_points"]
+            "points": points
         })
     return leaderboard
 
-@api_router.get("/leaderboard", response_model=List[LeaderboardEntry])
-async def get_leaderboard():
-    return await get_leaderboard_data()
+@api_router.get("/leaderboard/events/{event_id}", response_model=List[EventStandingEntry])
+async def get_event_leaderboard(event_id: str):
+    """Standings within a single event, from the in-memory score matrix"""
+    leaderboard = event_leaderboard_data(event_id)
+    if leaderboard is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return leaderboard
+
+@api_router.get("/leaderboard/matrix")
+async def get_score_matrix():
+    """Points per event (rows) and college (columns)"""
+    return scores.export()
+
+@api_router.get("/colleges/{college_id}/breakdown", response_model=CollegeBreakdown)
+async def get_college_breakdown(college_id: str):
+    breakdown = scores.college_breakdown(college_id)
+    if breakdown is None:
+        raise HTTPException(status_code=404, detail="College not found")
+    college = scores.college_info[college_id]
+    events = [
+        EventPoints(event_id=event_id, event_title=scores.event_info[event_id]["title"],
+                    event_code=scores.event_info[event_id]["code"], points=points)
+        for event_id, points in breakdown
+    ]
+    return CollegeBreakdown(
+        college_id=college_id,
+        college_name=college["name"],
+        college_code=college["code"],
+        total_points=sum(e.points for e in events),
+        events=events
+    )
+
+@api_router.get("/leaderboard/colleges/{college_id}", response_model=LeaderboardEntry)
+async def get_college_standing(college_id: str):
+    entry = standings.entry_for(college_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="College not found")
+    return entry
 
 # WebSocket
+WS_VIEW_MAX_TOP = 1000
+
+def leaderboard_view_room(top: Optional[int], college: Optional[str], event: Optional[str]) -> Optional[str]:
+    """Room for a subscription spec; "leaderboard" (the full table) when none
+    is given, None when the spec is invalid or names an unknown college/event."""
+    given = [v for v in (top, college, event) if v is not None]
+    if not given:
+        return "leaderboard"
+    if len(given) > 1:
+        return None
+    if top is not None:
+        return f"leaderboard:top:{top}" if 1 <= top <= WS_VIEW_MAX_TOP else None
+    if college is not None:
+        return f"leaderboard:college:{college}" if publisher.college_entry(college) else None
+    return f"leaderboard:event:{event}" if event in scores.events else None
+
 @app.websocket("/ws/leaderboard")
-async def websocket_leaderboard(websocket: WebSocket):
-    await manager.connect(websocket, "leaderboard")
+async def websocket_leaderboard(websocket: WebSocket, top: Optional[int] = None, college: Optional[str] = None,
+                                event: Optional[str] = None):
+    # ?top=10, ?college=<code> or ?event=<event id> subscribe to a view that is
+    # only pushed when it changes; no parameters streams the full table as deltas
+    room = leaderboard_view_room(top, college, event)
+    if room is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    is_view = room != "leaderboard"
+    if is_view:
+        manager.register_snapshot(room, lambda: publisher.view_message(room))
+    snapshot = (lambda: publisher.view_message(room)) if is_view else publisher.snapshot_message
+    
+    # The full table is also offered as MessagePack binary frames; control
+    # messages (ping, resync) stay text in both protocols
+    subprotocol = None
+    packed = not is_view and msgpack is not None and MSGPACK_SUBPROTOCOL in websocket.scope.get("subprotocols", [])
+    if packed:
+        room, snapshot, subprotocol = PACKED_LEADERBOARD_ROOM, publisher.snapshot_packed, MSGPACK_SUBPROTOCOL
+    
+    await manager.connect(websocket, room, subprotocol)
     try:
         # Send initial data
-        await websocket.send_json({
-            "type": "leaderboard_update",
-            "data": await get_leaderboard_data()
-        })
+        manager.send(websocket, snapshot(), room)
         while True:
             # Keep connection alive
             data = await websocket.receive_text()
             if data == "ping":
-                await websocket.send_text("pong")
+                manager.send(websocket, "pong", room)
+                continue
+            # Clients that detect a version gap ask to be brought up to date:
+            # {"type": "resync", "version": <last version applied>}
+            try:
+                request = json.loads(data)
+            except ValueError:
+                continue
+            if isinstance(request, dict) and request.get("type") == "resync":
+                if is_view or packed:
+                    manager.send(websocket, snapshot(), room)
+                    continue
+                version = request.get("version")
+                for message in publisher.messages_since(version if isinstance(version, int) else None):
+                    manager.send(websocket, message, room)
     except WebSocketDisconnect:
-        manager.disconnect(websocket, "leaderboard")
+        pass
+    finally:
+        manager.disconnect(websocket, room)
 
 # Admin - Get all users
 @api_router.get("/admin/users", response_model=List[User])
@@ -380,15 +1542,207 @@ async def get_all_users(current_user: dict = Depends(get_admin_user)):
     users = await db.users.find({}, {"_id": 0, "password_hash": 0}).to_list(1000)
     return [User(**u) for u in users]
 
+@api_router.get("/admin/indexes")
+async def verify_indexes(current_user: dict = Depends(get_admin_user)):
+    """Admin only: report missing or uncovered indexes (read only; the server
+    creates them at startup)"""
+    return await check_indexes(db)
+
+@api_router.post("/admin/reconcile", dependencies=[Depends(expensive_route)])
+async def reconcile_points(full: bool = False, dry_run: bool = False,
+                           current_user: dict = Depends(rate_limited("admin", get_admin_user))):
+    """Admin only: recompute college totals from results and repair any drift"""
+    report = await reconciler.run(full=full, repair=not dry_run)
+    await apply_reconcile_report(report)
+    return report
+
+@api_router.post("/admin/leaderboard/snapshots", dependencies=[Depends(expensive_route)])
+async def take_leaderboard_snapshot(current_user: dict = Depends(rate_limited("admin", get_admin_user))):
+    """Admin only: snapshot the standings as of now (e.g. at the closing ceremony),
+    less the settle window so that writes still in flight are not left out"""
+    snapshot = await history.take_snapshot(history.settled_as_of().isoformat())
+    if snapshot is None:
+        raise HTTPException(status_code=409, detail="A newer snapshot already exists")
+    return {"as_of": snapshot["as_of"], "colleges": len(snapshot["totals"]), "cells": len(snapshot["cells"])}
+
+# Exports
+RESULT_EXPORT_COLUMNS = [
+    "result_id", "timestamp", "event_id", "event_code", "event_title", "college_id", "college_code", "college_name",
+    "points", "achievement_statement", "recorded_by"
+]
+LEADERBOARD_EXPORT_COLUMNS = ["rank", "college_code", "college_name", "total_points"]
+
+def export_response(rows, columns: List[str], format: str, name: str, slot: GateSlot) -> StreamingResponse:
+    """Stream `rows` (an async iterator of row lists, one list per batch) as
+    CSV or NDJSON, so memory stays at one batch whatever the export size.
+    `slot` is released when the stream ends, fails or is cancelled."""
+    async def stream():
+        try:
+            if format == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerow(columns)
+                yield buffer.getvalue()
+                async for batch in rows:
+                    buffer.seek(0)
+                    buffer.truncate()
+                    writer.writerows(batch)
+                    yield buffer.getvalue()
+            else:
+                async for batch in rows:
+                    yield b"".join(dumps_bytes(dict(zip(columns, row))) + b"\n" for row in batch)
+        finally:
+            slot.release()
+    
+    filename = f"{name}-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.{format}"
+    media_type = "text/csv; charset=utf-8" if format == "csv" else "application/x-ndjson"
+    # The background task only matters when the client leaves before the
+    # stream starts, so the generator's finally never runs; release() is idempotent
+    return StreamingResponse(stream(), media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+                             background=BackgroundTask(slot.release))
+
+async def export_result_rows(results: List[dict]) -> List[list]:
+    events = await event_cache.get_many(r["event_id"] for r in results)
+    colleges = await college_cache.get_many(r["college_id"] for r in results)
+    rows = []
+    for r in results:
+        # Results of deleted events/colleges keep their ids, with blank names
+        event = events.get(r["event_id"], {})
+        college = colleges.get(r["college_id"], {})
+        rows.append([
+            r["id"], r["timestamp"], r["event_id"], event.get("code", ""), event.get("title", ""),
+            r["college_id"], college.get("code", ""), college.get("name", ""),
+            r["points"], r.get("achievement_statement", ""), r.get("recorded_by", "")
+        ])
+    return rows
+
+@api_router.get("/admin/export/results")
+async def export_results(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    event_id: Optional[str] = None,
+    college_id: Optional[str] = None,
+    batch_size: int = Query(EXPORT_BATCH_SIZE, ge=1, le=10000),
+    current_user: dict = Depends(rate_limited("admin", get_admin_user))
+):
+    """Admin only: every result, oldest first, with event and college names.
+    Rows are streamed one cursor batch at a time; names come from the
+    in-memory event and college caches."""
+    match: Dict[str, Any] = {}
+    if event_id:
+        match["event_id"] = event_id
+    if college_id:
+        match["college_id"] = college_id
+    slot = acquire_expensive_slot()
+    cursor = db.results.aggregate([
+        {"$match": match},
+        {"$sort": {"timestamp": 1, "id": 1}},
+        {"$project": {"_id": 0, "id": 1, "timestamp": 1, "event_id": 1, "college_id": 1, "points": 1,
+                      "achievement_statement": 1, "recorded_by": 1}}
+    ], batchSize=batch_size)
+    
+    async def rows():
+        batch = []
+        async for r in cursor:
+            batch.append(r)
+            if len(batch) >= batch_size:
+                yield await export_result_rows(batch)
+                batch = []
+        if batch:
+            yield await export_result_rows(batch)
+    
+    return export_response(rows(), RESULT_EXPORT_COLUMNS, format, "results", slot)
+
+@api_router.get("/admin/export/leaderboard")
+async def export_leaderboard(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    as_of: Optional[datetime] = None,
+    current_user: dict = Depends(rate_limited("admin", get_admin_user))
+):
+    """Admin only: final standings, or the standings at `as_of`"""
+    slot = acquire_expensive_slot()
+    try:
+        if as_of is not None:
+            entries = await history.standings_at(to_timestamp(as_of))
+        else:
+            entries = await get_leaderboard_data()
+    except BaseException:
+        slot.release()
+        raise
+    
+    async def rows():
+        for start in range(0, len(entries), EXPORT_BATCH_SIZE):
+            yield [[e["rank"], e["college_code"], e["college_name"], e["total_points"]]
+                   for e in entries[start:start + EXPORT_BATCH_SIZE]]
+    
+    return export_response(rows(), LEADERBOARD_EXPORT_COLUMNS, format, "leaderboard", slot)
+
+@api_router.get("/admin/cache/stats")
+async def get_cache_stats(current_user: dict = Depends(get_admin_user)):
+    return {
+        "events": event_cache.stats(),
+        "colleges": college_cache.stats(),
+        "principals": principal_cache.stats(),
+        "responses": response_cache.stats()
+    }
+
+@api_router.get("/admin/admission/stats")
+async def get_admission_stats(current_user: dict = Depends(get_admin_user)):
+    return {"rate_limits": rate_limiter.stats(), "expensive_routes": expensive_gate.stats()}
+
+@api_router.get("/admin/ws/stats")
+async def get_websocket_stats(current_user: dict = Depends(get_admin_user)):
+    return {**manager.stats(), "publisher": publisher.stats(), "shared_feed": shared_feed.stats()}
+
+# Metrics read from existing state at scrape time
+metrics.gauge_function("websocket_connections", "Open WebSocket connections per room",
+                       lambda: {room: len(subs) for room, subs in manager.active_connections.items()}, ("room",))
+metrics.gauge_function("websocket_send_failures_total", "WebSocket sends that failed or timed out",
+                       lambda: manager.send_failures, kind="counter")
+metrics.gauge_function("websocket_dropped_messages_total", "Messages discarded for slow WebSocket clients",
+                       lambda: manager.dropped_messages, kind="counter")
+metrics.gauge_function("websocket_slow_disconnects_total", "Slow WebSocket clients disconnected",
+                       lambda: manager.slow_disconnects, kind="counter")
+metrics.gauge_function("leaderboard_publishes_total", "Leaderboard deltas broadcast",
+                       lambda: publisher.published, kind="counter")
+metrics.gauge_function("leaderboard_version", "Current leaderboard version", lambda: publisher.version)
+metrics.gauge_function("entity_cache_hits_total", "Event/college lookups served from memory",
+                       lambda: {"event": event_cache.hits, "college": college_cache.hits}, ("entity",), kind="counter")
+metrics.gauge_function("entity_cache_misses_total", "Event/college lookups that went to MongoDB",
+                       lambda: {"event": event_cache.misses, "college": college_cache.misses}, ("entity",), kind="counter")
+metrics.gauge_function("password_hash_in_flight", "bcrypt operations running",
+                       lambda: password_hasher.in_flight)
+metrics.gauge_function("password_hash_waiting", "bcrypt operations waiting for a slot",
+                       lambda: password_hasher.waiting)
+metrics.gauge_function("password_hash_rejected_total", "bcrypt operations rejected as busy (503)",
+                       lambda: password_hasher.rejected, kind="counter")
+metrics.gauge_function("admission_rejected_total", "Requests turned away with 429, per route class",
+                       lambda: {**{("rate_limited", c): n for c, n in rate_limiter.rejected.items()},
+                                ("overloaded", "expensive"): expensive_gate.rejected},
+                       ("reason", "route_class"), kind="counter")
+metrics.gauge_function("expensive_requests_in_flight", "Requests holding an expensive route slot",
+                       lambda: expensive_gate.in_flight)
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # Include router
 app.include_router(api_router)
 
+if METRICS_ENABLED:
+    app.add_middleware(RouteMetricsMiddleware, latency=http_request_duration, responses=http_responses,
+                       exclude=["/metrics"])
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Retry-After"],
 )
 
 logging.basicConfig(
@@ -397,6 +1751,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def startup_load_standings():
+    await ensure_indexes(db)
+    await load_entities()
+    await load_standings()
+    await shared_feed.start(apply_shared_change)
+    publisher.start()
+    reconciler.start_periodic(RECONCILE_INTERVAL_SECONDS, on_report=apply_reconcile_report)
+    history.start_periodic()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await publisher.stop()
+    await reconciler.stop()
+    await history.stop()
+    await shared_feed.stop()
+    await rate_limiter.close()
+    password_hasher.shutdown()
     client.close()
\ No newline at end of file
@@ -0,0 +1,217 @@
+import asyncio
+import logging
+from datetime import datetime, timezone, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Cell = Tuple[str, str]  # (event_id, college_id)
+
+
+def _rank_key(college: dict):
+    # Same order as LeaderboardIndex: points desc, then code, then id
+    return (-college["total_points"], college["code"], college["id"])
+
+
+class LeaderboardHistory:
+    """Point-in-time standings from the results log.
+
+    Every `interval` seconds the per (event, college) points as of a settled
+    instant are stored in `leaderboard_snapshots`. The state at any time T is
+    the latest snapshot at or before T plus the results recorded after it.
+
+    Deleting a result removes it from `results`, so deletions are kept in
+    `result_tombstones` with a `deleted_at` time: a result counts at T when
+    timestamp <= T < deleted_at. With a snapshot at S, that gives
+
+        state(T) = snapshot(S)
+                   + results with S < timestamp <= T
+                   + tombstones with S < timestamp <= T and deleted_at > T
+                   - tombstones with timestamp <= S and S < deleted_at <= T
+
+    so a query only reads what happened since the snapshot. Timestamps are
+    ISO-8601 UTC strings and compare as strings, as everywhere else.
+    """
+
+    def __init__(self, db, interval: float = 300.0, settle_seconds: float = 5.0):
+        self.db = db
+        self.interval = interval
+        self.settle_seconds = settle_seconds
+        self.taken = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def record_deleted(self, results: Iterable[dict]) -> list:
+        """Tombstone results about to be deleted; returns the tombstone ids
+        for forget_deleted() should the delete not happen after all."""
+        deleted_at = datetime.now(timezone.utc).isoformat()
+        tombstones = [
+            {"id": r["id"], "event_id": r["event_id"], "college_id": r["college_id"], "points": r["points"],
+             "timestamp": r["timestamp"], "deleted_at": deleted_at}
+            for r in results if r.get("timestamp")
+        ]
+        if not tombstones:
+            return []
+        inserted = await self.db.result_tombstones.insert_many(tombstones, ordered=False)
+        return inserted.inserted_ids
+
+    async def forget_deleted(self, tombstone_ids: list):
+        if tombstone_ids:
+            await self.db.result_tombstones.delete_many({"_id": {"$in": tombstone_ids}})
+
+    async def latest_snapshot(self, as_of: Optional[str] = None, projection: Optional[dict] = None) -> Optional[dict]:
+        query = {"as_of": {"$lte": as_of}} if as_of is not None else {}
+        return await self.db.leaderboard_snapshots.find_one(
+            query, {"_id": 0, **(projection or {})}, sort=[("as_of", -1)])
+
+    async def _sum(self, collection: str, match: dict, by_event: bool) -> Dict:
+        key = {"event_id": "$event_id", "college_id": "$college_id"} if by_event else "$college_id"
+        pipeline = [{"$match": match}, {"$group": {"_id": key, "points": {"$sum": "$points"}}}]
+        sums = {}
+        async for row in self.db[collection].aggregate(pipeline):
+            group = row["_id"]
+            sums[(group["event_id"], group["college_id"]) if by_event else group] = row["points"]
+        return sums
+
+    async def _replay(self, base: Optional[dict], as_of: Optional[str], by_event: bool) -> Dict:
+        """Points per cell (or per college) at `as_of` (None: now), starting from `base`."""
+        since = base["as_of"] if base else None
+        points: Dict = {}
+        if base:
+            if by_event:
+                event_ids, college_ids = base["event_ids"], base["college_ids"]
+                for row, col, value in base["cells"]:
+                    points[(event_ids[row], college_ids[col])] = value
+            else:
+                points.update(base["totals"])
+
+        def window(field: str, low: Optional[str], high: Optional[str]) -> dict:
+            bounds = {}
+            if low is not None:
+                bounds["$gt"] = low
+            if high is not None:
+                bounds["$lte"] = high
+            return {field: bounds} if bounds else {}
+
+        terms = [("results", window("timestamp", since, as_of), 1)]
+        if as_of is not None:
+            terms.append(("result_tombstones", {**window("timestamp", since, as_of),
+                                                "deleted_at": {"$gt": as_of}}, 1))
+        if since is not None:
+            terms.append(("result_tombstones", {"timestamp": {"$lte": since},
+                                                **window("deleted_at", since, as_of)}, -1))
+        for collection, match, sign in terms:
+            for key, value in (await self._sum(collection, match, by_event)).items():
+                points[key] = points.get(key, 0) + sign * value
+        return points
+
+    async def cells_at(self, as_of: Optional[str] = None) -> Dict[Cell, int]:
+        """Points per (event_id, college_id) at `as_of`, or now."""
+        base = await self.latest_snapshot(as_of)
+        return await self._replay(base, as_of, by_event=True)
+
+    async def _college_info(self, base: Optional[dict]) -> Dict[str, dict]:
+        # Colleges have no creation time, so a past leaderboard lists the
+        # colleges known to the snapshot plus those that exist now
+        info = {c["id"]: c for c in (base or {}).get("colleges", [])}
+        async for college in self.db.colleges.find({}, {"_id": 0, "id": 1, "name": 1, "code": 1}):
+            info[college["id"]] = college
+        return info
+
+    @staticmethod
+    def _rank(info: Dict[str, dict], totals: Dict[str, int]) -> List[dict]:
+        colleges = [dict(c, total_points=totals.get(cid, 0)) for cid, c in info.items()]
+        colleges.sort(key=_rank_key)
+        return colleges
+
+    async def standings_at(self, as_of: str, limit: Optional[int] = None) -> List[dict]:
+        base = await self.latest_snapshot(as_of, {"cells": 0, "ranks": 0})
+        totals = await self._replay(base, as_of, by_event=False)
+        ranked = self._rank(await self._college_info(base), totals)
+        return [
+            {"rank": idx, "college_name": c["name"], "college_code": c["code"], "total_points": c["total_points"]}
+            for idx, c in enumerate(ranked[:limit], 1)
+        ]
+
+    def settled_as_of(self) -> datetime:
+        """Latest time a snapshot may be taken at: writes stamped before it
+        have landed (a result insert, or a delete after its tombstone)."""
+        return datetime.now(timezone.utc) - timedelta(seconds=self.settle_seconds)
+
+    async def take_snapshot(self, as_of: Optional[str] = None) -> Optional[dict]:
+        """Store the state at `as_of` (default: the last settled interval
+        boundary). Idempotent per as_of, so several workers can run it."""
+        if as_of is None:
+            boundary = self.settled_as_of().timestamp() // self.interval * self.interval
+            as_of = datetime.fromtimestamp(boundary, timezone.utc).isoformat()
+        latest = await self.latest_snapshot(projection={"as_of": 1})
+        if latest and latest["as_of"] >= as_of:
+            return None
+
+        base = await self.latest_snapshot(as_of)
+        cells = await self._replay(base, as_of, by_event=True)
+        info = await self._college_info(base)
+        event_ids: Dict[str, int] = {}
+        college_ids: Dict[str, int] = {cid: i for i, cid in enumerate(info)}
+        totals: Dict[str, int] = {}
+        packed = []
+        for (event_id, college_id), points in cells.items():
+            if points == 0 or college_id not in college_ids:
+                continue
+            row = event_ids.setdefault(event_id, len(event_ids))
+            packed.append([row, college_ids[college_id], points])
+            totals[college_id] = totals.get(college_id, 0) + points
+
+        snapshot = {
+            "as_of": as_of,
+            "taken_at": datetime.now(timezone.utc).isoformat(),
+            "colleges": [{"id": c["id"], "name": c["name"], "code": c["code"]} for c in info.values()],
+            "event_ids": list(event_ids),
+            "college_ids": list(college_ids),
+            "cells": packed,
+            "totals": totals,
+            "ranks": {c["id"]: idx for idx, c in enumerate(self._rank(info, totals), 1)}
+        }
+        await self.db.leaderboard_snapshots.update_one(
+            {"as_of": as_of}, {"$setOnInsert": snapshot}, upsert=True)
+        self.taken += 1
+        return snapshot
+
+    async def college_history(self, college_id: str, since: Optional[str] = None, until: Optional[str] = None,
+                              limit: int = 500) -> List[dict]:
+        """Total points and rank of one college at each snapshot in range."""
+        query = {}
+        if since is not None:
+            query.setdefault("as_of", {})["$gte"] = since
+        if until is not None:
+            query.setdefault("as_of", {})["$lte"] = until
+        projection = {"_id": 0, "as_of": 1, f"totals.{college_id}": 1, f"ranks.{college_id}": 1}
+        cursor = self.db.leaderboard_snapshots.find(query, projection).sort("as_of", -1).limit(limit)
+        points = []
+        async for snapshot in cursor:
+            rank = snapshot.get("ranks", {}).get(college_id)
+            if rank is None:
+                continue
+            points.append({"as_of": snapshot["as_of"], "total_points": snapshot.get("totals", {}).get(college_id, 0),
+                           "rank": rank})
+        points.reverse()
+        return points
+
+    def start_periodic(self):
+        async def loop():
+            while True:
+                try:
+                    await self.take_snapshot()
+                except Exception:
+                    logger.exception("Leaderboard snapshot failed")
+                await asyncio.sleep(self.interval)
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
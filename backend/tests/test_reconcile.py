@@ -0,0 +1,170 @@
+import asyncio
+import sys
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from reconcile import PointsReconciler  # noqa: E402
+
+
+def ago(seconds: float) -> str:
+    return (datetime.now(timezone.utc) - timedelta(seconds=seconds)).isoformat()
+
+
+@pytest.fixture
+def db():
+    return AsyncMongoMockClient()["reconcile_test"]
+
+
+@pytest.fixture
+def reconciler(db):
+    return PointsReconciler(db, settle_seconds=0, confirm_delay=0)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def add_college(db, college_id: str, total_points: int = 0):
+    await db.colleges.insert_one({"id": college_id, "total_points": total_points})
+
+
+async def add_result(db, result_id: str, college_id: str, points: int, timestamp: str = None, inc: bool = True):
+    result = {"id": result_id, "college_id": college_id, "points": points, "timestamp": timestamp or ago(0)}
+    await db.results.insert_one(dict(result))
+    if inc:
+        await db.colleges.update_one({"id": college_id}, {"$inc": {"total_points": points}})
+    return result
+
+
+async def delete_result(db, reconciler, result: dict):
+    async with reconciler.deleting():
+        await db.results.delete_one({"id": result["id"]})
+        reconciler.note_deleted(result)
+    await db.colleges.update_one({"id": result["college_id"]}, {"$inc": {"total_points": -result["points"]}})
+
+
+async def total(db, college_id: str) -> int:
+    return (await db.colleges.find_one({"id": college_id}))["total_points"]
+
+
+def test_baseline_then_incremental_passes_agree(db, reconciler):
+    async def scenario():
+        await add_college(db, "c1")
+        await add_result(db, "r1", "c1", 10)
+        first = await reconciler.run()
+        await add_result(db, "r2", "c1", 50)
+        second = await reconciler.run()
+        return first, second, await total(db, "c1")
+
+    first, second, points = run(scenario())
+    assert (first["mode"], first["drifted"]) == ("full", [])
+    assert (second["mode"], second["drifted"]) == ("incremental", [])
+    assert points == 60
+
+
+def test_real_drift_is_repaired(db, reconciler):
+    async def scenario():
+        await add_college(db, "c1")
+        await add_result(db, "r1", "c1", 10)
+        await reconciler.run()
+        await db.colleges.update_one({"id": "c1"}, {"$inc": {"total_points": 999}})
+        return await reconciler.run(), await total(db, "c1")
+
+    report, points = run(scenario())
+    assert report["repaired"] == 1
+    assert report["drifted"] == [{"college_id": "c1", "total_points": 1009, "expected_points": 10}]
+    assert points == 10
+
+
+def test_dry_run_does_not_write(db, reconciler):
+    async def scenario():
+        await add_college(db, "c1", total_points=5)
+        return await reconciler.run(repair=False), await total(db, "c1")
+
+    report, points = run(scenario())
+    assert report["dry_run"] and report["repaired"] == 0
+    assert len(report["drifted"]) == 1
+    assert points == 5
+
+
+def test_noted_delete_leaves_baseline_once(db, reconciler):
+    async def scenario():
+        await add_college(db, "c1")
+        result = await add_result(db, "r1", "c1", 10)
+        await add_result(db, "r2", "c1", 50)
+        await reconciler.run()
+        await delete_result(db, reconciler, result)
+        report = await reconciler.run()
+        return report, await total(db, "c1")
+
+    report, points = run(scenario())
+    assert (report["mode"], report["drifted"], report["repaired"]) == ("incremental", [], 0)
+    assert points == 50
+
+
+def test_delete_overlapping_a_pass_marks_baseline_stale(db, reconciler):
+    async def scenario():
+        await add_college(db, "c1")
+        result = await add_result(db, "r1", "c1", 10)
+        await add_result(db, "r2", "c1", 50)
+        sum_points = reconciler._sum_points
+
+        async def sum_during_delete(match):
+            # The delete lands before the first sum, its note only after it
+            reconciler._sum_points = sum_points
+            async with reconciler.deleting():
+                await db.results.delete_one({"id": result["id"]})
+                summed = await sum_points(match)
+            reconciler.note_deleted(result)
+            await db.colleges.update_one({"id": "c1"}, {"$inc": {"total_points": -10}})
+            return summed
+
+        reconciler._sum_points = sum_during_delete
+        first = await reconciler.run()
+        second = await reconciler.run()
+        return first, second, await total(db, "c1")
+
+    first, second, points = run(scenario())
+    assert first["repaired"] == 0
+    assert (second["mode"], second["drifted"], second["repaired"]) == ("full", [], 0)
+    assert points == 50
+
+
+def test_late_insert_below_high_water_mark_is_not_repaired_away(db, reconciler):
+    async def scenario():
+        await add_college(db, "c1")
+        await add_result(db, "r1", "c1", 10)
+        timestamp = ago(0.5)
+        await reconciler.run()
+        # Stamped before the pass's high-water mark, visible only after it
+        await add_result(db, "r2", "c1", 50, timestamp=timestamp)
+        first = await reconciler.run()
+        second = await reconciler.run()
+        return first, second, await total(db, "c1")
+
+    first, second, points = run(scenario())
+    assert first["unverified"] == ["c1"]
+    assert (first["drifted"], first["repaired"]) == ([], 0)
+    assert (second["mode"], second["drifted"]) == ("full", [])
+    assert points == 60
+
+
+def test_invalidate_forces_full_pass_without_repair(db, reconciler):
+    async def scenario():
+        await add_college(db, "c1")
+        await add_result(db, "r1", "c1", 10)
+        await reconciler.run()
+        # Deleted by another worker: the order against this worker's passes is unknown
+        await db.results.delete_one({"id": "r1"})
+        await db.colleges.update_one({"id": "c1"}, {"$inc": {"total_points": -10}})
+        reconciler.invalidate()
+        return await reconciler.run(), await total(db, "c1")
+
+    report, points = run(scenario())
+    assert (report["mode"], report["drifted"], report["repaired"]) == ("full", [], 0)
+    assert points == 0
@@ -42,19 +42,16 @@ const AdminDashboard = () => {
 
   const fetchData = async () => {
     try {
-      const [collegesRes, eventsRes, usersRes] = await Promise.all([
-        fetch(`${API}/colleges`, { headers: getAuthHeaders() }),
-        fetch(`${API}/events`, { headers: getAuthHeaders() }),
-        fetch(`${API}/admin/users`, { headers: getAuthHeaders() }),
-      ]);
-
-      const collegesData = await collegesRes.json();
-      const eventsData = await eventsRes.json();
-      const usersData = await usersRes.json();
+      // Colleges, events and users in one round-trip
+      const response = await fetch(`${API}/dashboard?include_results=false`, { headers: getAuthHeaders() });
+      if (!response.ok) {
+        throw new Error(`Dashboard request failed: ${response.status}`);
+      }
+      const data = await response.json();
 
-      setColleges(collegesData);
-      setEvents(eventsData);
-      setUsers(usersData);
+      setColleges(data.colleges);
+      setEvents(data.events);
+      setUsers(data.users);
     } catch (error) {
       console.error("Error fetching data:", error);
       toast.error("Failed to load data");
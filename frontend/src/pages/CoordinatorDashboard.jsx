@@ -1,4 +1,4 @@
-import { useState, useEffect, useMemo } from "react";
+import { useState, useEffect, useRef } from "react";
 import { useNavigate } from "react-router-dom";
 import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
@@ -25,6 +25,7 @@ const CoordinatorDashboard = () => {
   const [loading, setLoading] = useState(false);
   const [collegeSearch, setCollegeSearch] = useState("");
   const [isCollegeDropdownOpen, setIsCollegeDropdownOpen] = useState(false);
+  const dashboardVersionRef = useRef(null);
   const navigate = useNavigate();
 
   useEffect(() => {
@@ -46,22 +47,32 @@ const CoordinatorDashboard = () => {
 
   const fetchData = async () => {
     try {
-      const [eventsRes, collegesRes, resultsRes] = await Promise.all([
-        fetch(`${API}/events`, { headers: getAuthHeaders() }),
-        fetch(`${API}/colleges`),
-        fetch(`${API}/results`),
-      ]);
-
-      const eventsData = await eventsRes.json();
-      const collegesData = await collegesRes.json();
-      const resultsData = await resultsRes.json();
-
-      setEvents(eventsData);
-      setColleges(collegesData);
-      setResults(resultsData);
-
-      if (eventsData.length > 0 && !selectedEvent) {
-        setSelectedEvent(eventsData[0].id);
+      // Only this coordinator's events and results; after the first load only
+      // what changed since the previous version is sent
+      const since = dashboardVersionRef.current;
+      const query = since ? `?since=${encodeURIComponent(since)}` : "";
+      const response = await fetch(`${API}/dashboard${query}`, { headers: getAuthHeaders() });
+      if (!response.ok) {
+        dashboardVersionRef.current = null;
+        throw new Error(`Dashboard request failed: ${response.status}`);
+      }
+      const data = await response.json();
+      dashboardVersionRef.current = data.version;
+
+      setEvents(data.events);
+      if (data.colleges) {
+        setColleges(data.colleges);
+      }
+      setResults((previous) => {
+        if (data.full) return data.results;
+        const removed = new Set(data.removed_result_ids);
+        const merged = new Map(previous.filter((r) => !removed.has(r.id)).map((r) => [r.id, r]));
+        data.results.forEach((r) => merged.set(r.id, r));
+        return Array.from(merged.values()).sort((a, b) => b.timestamp.localeCompare(a.timestamp));
+      });
+
+      if (data.events.length > 0 && !selectedEvent) {
+        setSelectedEvent(data.events[0].id);
       }
     } catch (error) {
       console.error("Error fetching data:", error);
@@ -69,15 +80,34 @@ const CoordinatorDashboard = () => {
     }
   };
 
-  // Filter colleges based on search (case-insensitive)
-  const filteredColleges = useMemo(() => {
-    if (!collegeSearch.trim()) return colleges;
-    
-    const searchTerm = collegeSearch.toLowerCase();
-    return colleges.filter(college => 
-      college.name.toLowerCase().includes(searchTerm) ||
-      college.code.toLowerCase().includes(searchTerm)
-    );
+  // Ranked search on the server; the full list is only shown before typing
+  const [filteredColleges, setFilteredColleges] = useState([]);
+  useEffect(() => {
+    const searchTerm = collegeSearch.trim();
+    if (!searchTerm) {
+      setFilteredColleges(colleges);
+      return;
+    }
+    const controller = new AbortController();
+    const timer = setTimeout(async () => {
+      try {
+        const response = await fetch(
+          `${API}/colleges/search?q=${encodeURIComponent(searchTerm)}&limit=20`,
+          { signal: controller.signal }
+        );
+        if (response.ok) {
+          setFilteredColleges(await response.json());
+        }
+      } catch (error) {
+        if (error.name !== "AbortError") {
+          console.error("Error searching colleges:", error);
+        }
+      }
+    }, 150);
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
   }, [colleges, collegeSearch]);
 
   const handleSubmitResult = async (e) => {
@@ -490,7 +520,7 @@ const CoordinatorDashboard = () => {
                     >
                       <div className="flex items-start justify-between mb-3">
                         <div className="flex-1">
-                          <p className="font-semibold text-white text-lg">{getCollegeName(result.college_id)}</p>
+                          <p className="font-semibold text-white text-lg">{result.college_name || getCollegeName(result.college_id)}</p>
                           <div className="flex items-center gap-4 mt-1">
                             <span className="text-sm text-gray-400">
                               Points: <span className="text-green-400 font-semibold text-lg">{result.points}</span>
@@ -1,4 +1,4 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { Trophy, Users, TrendingUp, Crown, Star, Medal, Award, Zap, Sparkles, Target, Flame, Gem, BarChart3, ChevronUp, ChevronDown } from "lucide-react";
 import { Button } from "@/components/ui/button";
 import { Card, CardContent } from "@/components/ui/card";
@@ -8,12 +8,25 @@ const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
 const WS_URL = BACKEND_URL.replace("https://", "wss://").replace("http://", "ws://");
 
+// Apply a leaderboard_delta message: entries are keyed by college_code and
+// only carry the fields that changed since the previous version.
+const applyLeaderboardDelta = (leaderboard, delta) => {
+  const byCode = new Map(leaderboard.map((entry) => [entry.college_code, entry]));
+  delta.removed.forEach((code) => byCode.delete(code));
+  delta.changed.forEach((change) => {
+    byCode.set(change.college_code, { ...byCode.get(change.college_code), ...change });
+  });
+  return [...byCode.values()].sort((a, b) => a.rank - b.rank);
+};
+
 const Leaderboard = () => {
   const [leaderboard, setLeaderboard] = useState([]);
   const [top10, setTop10] = useState([]);
   const [loading, setLoading] = useState(true);
   const [showAll, setShowAll] = useState(false);
   const navigate = useNavigate();
+  const versionRef = useRef(null);
+  const resyncPendingRef = useRef(false);
 
   useEffect(() => {
     fetchLeaderboard();
@@ -47,9 +60,25 @@ const Leaderboard = () => {
       };
 
       ws.onmessage = (event) => {
+        if (event.data === "pong") return;
         const message = JSON.parse(event.data);
         if (message.type === "leaderboard_update") {
+          versionRef.current = message.version;
+          resyncPendingRef.current = false;
           setLeaderboard(message.data);
+        } else if (message.type === "leaderboard_delta") {
+          if (message.version <= versionRef.current) return;
+          if (message.base_version !== versionRef.current) {
+            // Missed an update: ask the server to bring us up to date
+            if (!resyncPendingRef.current) {
+              resyncPendingRef.current = true;
+              ws.send(JSON.stringify({ type: "resync", version: versionRef.current }));
+            }
+            return;
+          }
+          versionRef.current = message.version;
+          resyncPendingRef.current = false;
+          setLeaderboard((prev) => applyLeaderboardDelta(prev, message));
         }
       };
 